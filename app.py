@@ -1,5 +1,6 @@
 import sys
 import os
+from contextlib import asynccontextmanager
 import certifi
 ca = certifi.where()
 import uvicorn
@@ -17,14 +18,56 @@ from uvicorn import run as app_run
 import pandas as pd
 
 from networksecurity.pipeline.training_pipeline import TrainingPipeline
-from networksecurity.utils.main_utils.utils import load_object
-from networksecurity.utils.ml_utils.model.estimator import NetworkModel
-from networksecurity.utils.feature_extractor import extract_features_from_url
+from networksecurity.utils.ml_utils.model.live_model import get_live_models
+from networksecurity.utils.feature_extractor import extract_features_from_url_async, extract_lexical_features
+from networksecurity.constant.feature_extractor import (
+    PREDICTION_CASCADE_ENABLED,
+    PREDICTION_CASCADE_CONFIDENCE_THRESHOLD,
+    PREDICTION_TIME_BUDGET,
+    INSTRUMENTATION_ENABLED,
+    DOMAIN_LIST_ENABLED,
+    PAGE_WORKERS_ENABLED,
+    REFRESH_AHEAD_ENABLED,
+)
+from networksecurity.utils.extractor_utils.domain_lists import get_domain_lists, VERDICT_BLOCK
+from networksecurity.utils.extractor_utils.feature_cache import get_feature_cache
+from networksecurity.utils.extractor_utils.instrumentation import ExtractionTrace, render_metrics
+from networksecurity.utils.extractor_utils.page_workers import get_page_worker_pool, PageWorkersOverloaded
+from networksecurity.utils.extractor_utils.refresh_ahead import get_refresh_ahead
+from networksecurity.utils.extractor_utils.singleflight import get_singleflight
 from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+
+client = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # done here rather than at import: the page worker processes import this
+    # module again under `python app.py`, and must not connect, load models
+    # or start threads of their own
+    global client
+    client = pymongo.MongoClient(mongo_db_url, tlsCAFile=ca)
+
+    # the models are loaded once here and swapped when the trainer writes a new final_model/manifest.json
+    try:
+        get_live_models().reload()
+    except Exception as e:
+        logging.info(f"No model loaded at startup, loading on the first prediction: {e}")
 
-client = pymongo.MongoClient(mongo_db_url, tlsCAFile=ca)
+    if PAGE_WORKERS_ENABLED:
+        get_page_worker_pool().enable()
 
-app = FastAPI()
+    # keep the domains and pages asked for most often cached
+    if REFRESH_AHEAD_ENABLED:
+        get_refresh_ahead().start()
+
+    yield
+
+    get_refresh_ahead().stop()
+    get_page_worker_pool().shutdown()
+    client.close()
+
+app = FastAPI(lifespan=lifespan)
 origins = ["*"]
 
 app.add_middleware(
@@ -46,7 +89,8 @@ async def train_route():
     try:
         train_pipeline = TrainingPipeline()
         train_pipeline.run_pipeline()
-        return Response("Training is successful")
+        snapshot = get_live_models().reload()
+        return Response(f"Training is successful, serving model version {snapshot.version}")
     except Exception as e:
         raise NetworkSecurityException(e, sys)
 
@@ -60,10 +104,7 @@ async def predict_form(request: Request):
 async def predict_route(request: Request, file: UploadFile = File(...)):
     try:
         df = pd.read_csv(file.file)
-        preprocessor = load_object("final_model/preprocessor.pkl")
-        final_model = load_object("final_model/model.pkl")
-        network_model = NetworkModel(preprocessor=preprocessor, model=final_model)
-        y_pred = network_model.predict(df)
+        y_pred = served_network_model(get_live_models().current()).predict(df)
         df['predicted_column'] = y_pred
         df.to_csv('prediction_output/output.csv', index=False)
         table_html = df.to_html(classes='table table-striped')
@@ -71,6 +112,18 @@ async def predict_route(request: Request, file: UploadFile = File(...)):
     except Exception as e:
         raise NetworkSecurityException(e, sys)
 
+def served_network_model(models):
+    if models.network_model is None:
+        raise Exception("No model has been trained yet, run /train first")
+    return models.network_model
+
+def lexical_prediction(url: str, models):
+    """(prediction, confidence) of the lexical model, None when it was not trained"""
+    if models.lexical_model is None:
+        return None
+    y_hat, confidence = models.lexical_model.predict_with_confidence([extract_lexical_features(url)])
+    return y_hat[0], confidence[0]
+
 # GET + POST for single URL prediction
 @app.get("/predict_url")
 async def predict_url_form(request: Request):
@@ -88,20 +141,69 @@ async def predict_url(request: Request, url: str = Form(...)):
             "DNSRecord", "web_traffic", "Page_Rank", "Google_Index", "Links_pointing_to_page",
             "Statistical_report"
         ]
-        features = extract_features_from_url(url)
-        df = pd.DataFrame([features], columns=feature_names)
+        pred = None
+        tier = "full"
+        imputed = 0
+        overloaded = False
+        lexical = None
+        trace = ExtractionTrace() if INSTRUMENTATION_ENABLED else None
+        # the models this request is answered with, even if new ones are swapped in meanwhile
+        models = get_live_models().current()
+
+        # Tier 0: registered domain on the local allow- or blocklist
+        verdict = get_domain_lists().check(url) if DOMAIN_LIST_ENABLED else None
+        if verdict is not None:
+            pred = 0 if verdict == VERDICT_BLOCK else 1
+            tier = verdict
+
+        # Tier 1: lexical model on the URL string alone, no network I/O
+        if pred is None and PREDICTION_CASCADE_ENABLED:
+            lexical = lexical_prediction(url, models)
+            if lexical is not None and lexical[1] >= PREDICTION_CASCADE_CONFIDENCE_THRESHOLD:
+                pred = lexical[0]
+                tier = "lexical"
+
+        # Tier 2: full network-backed extraction, unless the page workers are full
+        if pred is None:
+            try:
+                page_workers = get_page_worker_pool()
+                if page_workers.enabled and page_workers.saturated:
+                    raise PageWorkersOverloaded("page workers are full")
+                # features not ready within the budget come back as NaN for the imputer;
+                # refreshes ahead wait while enough of these are in flight
+                with get_refresh_ahead().live_request():
+                    features = await extract_features_from_url_async(
+                        url, trace=trace, time_budget=PREDICTION_TIME_BUDGET, shed_load=page_workers.enabled,
+                    )
+            except PageWorkersOverloaded:
+                overloaded = True
+                lexical = lexical or lexical_prediction(url, models)
+                if lexical is None:
+                    return templates.TemplateResponse("table.html", {
+                        "request": request,
+                        "url": url,
+                        "prediction": "Error: the server is overloaded, try again shortly"
+                    }, status_code=503, headers={"Retry-After": "1"})
+                # the lexical verdict, whatever its confidence
+                pred = lexical[0]
+                tier = "lexical"
+
+        if pred is None:
+            df = pd.DataFrame([features], columns=feature_names)
+            imputed = int(df.isna().sum().sum())
+            pred = served_network_model(models).predict(df)[0]
 
-        preprocessor = load_object("final_model/preprocessor.pkl")
-        final_model = load_object("final_model/model.pkl")
-        network_model = NetworkModel(preprocessor=preprocessor, model=final_model)
-
-        pred = network_model.predict(df)[0]
         prediction_label = "Legitimate" if pred == 1 else "Phishing"
 
         return templates.TemplateResponse("table.html", {
             "request": request,
             "url": url,
-            "prediction": prediction_label
+            "prediction": prediction_label,
+            "tier": tier,
+            "imputed": imputed,
+            "overloaded": overloaded,
+            "model_version": models.version,
+            "trace": trace.to_dict() if trace else None
         })
     except Exception as e:
         return templates.TemplateResponse("table.html", {
@@ -110,6 +212,41 @@ async def predict_url(request: Request, url: str = Form(...)):
             "prediction": f"Error: {str(e)}"
         })
 
+@app.get("/model_version")
+async def model_version():
+    """Version of the models being served and when they were loaded"""
+    try:
+        return get_live_models().current().describe()
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+@app.get("/reload_model")
+async def reload_model():
+    """Load the artifacts under final_model/ now and serve them"""
+    try:
+        return get_live_models().reload().describe()
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+@app.get("/reload_domain_lists")
+async def reload_domain_lists():
+    """Reread the allow- and blocklist files"""
+    try:
+        return get_domain_lists().reload()
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+
+@app.get("/metrics")
+async def metrics():
+    """
+    Extractor stage and feature histograms, FeatureCache, refresh-ahead and
+    singleflight counters in the Prometheus text format
+    """
+    counters = (get_feature_cache().render_metrics() + get_refresh_ahead().render_metrics()
+                + get_singleflight().render_metrics())
+    text = render_metrics() + "\n".join(counters) + "\n"
+    return Response(text, media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8000))
     app_run("app:app", host="0.0.0.0", port=port)
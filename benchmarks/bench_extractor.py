@@ -0,0 +1,180 @@
+"""
+URLs per second, per-feature latency and peak memory of the full feature
+extractor, replayed offline from a fixture file recorded with
+
+    python -m networksecurity.utils.extractor_utils.replay_harness record urls.txt -o fixtures.json
+
+and run as a module from the repository root, so networksecurity is
+importable without installing it:
+
+    python -m benchmarks.bench_extractor fixtures.json
+    python -m benchmarks.bench_extractor fixtures.json --latency 1 --json baseline.json
+    python -m benchmarks.bench_extractor fixtures.json --latency 1 --baseline baseline.json
+
+Every run starts with cold caches, and each variant reports the best of
+--repeat runs for its URLs/s and memory peak. The run fails when features
+differ from the recording, and with --baseline (the --json output of an
+earlier run on the same fixtures and latency) when a variant's URLs/s
+drops, or its memory peak or a stage's p95 grows, by more than
+--tolerance. A fixture of a few URLs varies by more than that from run to
+run; record a few hundred for a baseline.
+
+Pages are parsed in this process: the page worker processes are only
+started by the API, so the tracemalloc peak covers the whole extraction
+except memory lxml allocates in C.
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+
+import numpy as np
+
+from networksecurity.constant.feature_extractor import URL_FEATURE_NAMES
+from networksecurity.utils.feature_extractor import extract_features_from_url, extract_features_from_url_async
+from networksecurity.utils.extractor_utils.batch_extractor import extract_features_batch
+from networksecurity.utils.extractor_utils.instrumentation import ExtractionTrace
+from networksecurity.utils.extractor_utils.replay_harness import ExtractorFixtures, replaying, replay_mismatches
+
+
+def run_sync(urls) -> list:
+    return [extract_features_from_url(url) for url in urls]
+
+
+def run_async(urls) -> list:
+    async def gather():
+        return await asyncio.gather(*(extract_features_from_url_async(url) for url in urls))
+    return list(asyncio.run(gather()))
+
+
+def run_batch(urls) -> list:
+    return [list(row) for row in extract_features_batch(urls).values]
+
+
+VARIANTS = {"sync": run_sync, "async": run_async, "batch": run_batch}
+
+
+def run_traced(urls) -> list:
+    async def gather():
+        traces = [ExtractionTrace() for _ in urls]
+        await asyncio.gather(*(extract_features_from_url_async(url, trace=trace) for url, trace in zip(urls, traces)))
+        return traces
+    return asyncio.run(gather())
+
+
+def latency_summary(traces, kind: str, names) -> dict:
+    """p50, p95 and max seconds of each stage or feature, with its outcome counts"""
+    summary = {}
+    for name in names:
+        records = [trace.to_dict()[kind][name] for trace in traces if name in trace.to_dict()[kind]]
+        if not records:
+            continue
+        seconds = np.array([record["seconds"] for record in records])
+        outcomes = {}
+        for record in records:
+            outcomes[record["outcome"]] = outcomes.get(record["outcome"], 0) + 1
+        summary[name] = {
+            "p50": float(np.percentile(seconds, 50)),
+            "p95": float(np.percentile(seconds, 95)),
+            "max": float(seconds.max()),
+            "outcomes": outcomes,
+        }
+    return summary
+
+
+def baseline_regressions(results: dict, baseline: dict, tolerance: float) -> list:
+    """Descriptions of the figures in results worse than in baseline by more than tolerance"""
+    if (results["urls"], results["latency"]) != (baseline["urls"], baseline["latency"]):
+        raise SystemExit(f"the baseline was run on {baseline['urls']} URLs at latency {baseline['latency']}, "
+                         f"not {results['urls']} at {results['latency']}")
+    regressions = []
+    for name, variant in results["variants"].items():
+        base = baseline["variants"].get(name)
+        if base is None:
+            continue
+        if variant["urls_per_second"] < base["urls_per_second"] * (1 - tolerance):
+            regressions.append(f"{name}: {variant['urls_per_second']:,.1f} URLs/s, "
+                               f"baseline {base['urls_per_second']:,.1f}")
+        if variant["peak_bytes"] and base["peak_bytes"] and variant["peak_bytes"] > base["peak_bytes"] * (1 + tolerance):
+            regressions.append(f"{name}: {variant['peak_bytes'] / 2 ** 20:.1f} MiB peak, "
+                               f"baseline {base['peak_bytes'] / 2 ** 20:.1f}")
+    for stage, stats in results["stages"].items():
+        base = baseline["stages"].get(stage)
+        # a millisecond of slack, sub-millisecond stages are mostly noise
+        if base is not None and stats["p95"] > base["p95"] * (1 + tolerance) + 0.001:
+            regressions.append(f"stage {stage}: p95 {stats['p95'] * 1000:.3f} ms, baseline {base['p95'] * 1000:.3f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("fixtures", help="fixture file written by replay_harness record")
+    parser.add_argument("--latency", type=float, default=0.0, help="scale of the recorded response times")
+    parser.add_argument("--variants", nargs="+", choices=list(VARIANTS), default=list(VARIANTS))
+    parser.add_argument("--repeat", type=int, default=3, help="runs of each variant, the best one is reported")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc runs")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--baseline", help="results of an earlier run (--json) to fail on regressions against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="fraction a figure may be worse than the baseline")
+    args = parser.parse_args()
+
+    fixtures = ExtractorFixtures.load(args.fixtures)
+    urls = list(fixtures.features)
+    results = {"urls": len(urls), "latency": args.latency, "variants": {}}
+
+    for name in args.variants:
+        # the best of the repeats, the others lost time to the scheduler
+        seconds = None
+        for _ in range(args.repeat):
+            with replaying(fixtures, args.latency):
+                start = time.perf_counter()
+                rows = VARIANTS[name](urls)
+                elapsed = time.perf_counter() - start
+            seconds = elapsed if seconds is None else min(seconds, elapsed)
+
+        mismatches = replay_mismatches(fixtures, dict(zip(urls, rows)))
+        if mismatches:
+            raise SystemExit(f"{name}: features differ from the recording for {len(mismatches)} URLs, "
+                             f"e.g. {next(iter(mismatches))}")
+
+        peak = None
+        if not args.no_memory:
+            for _ in range(args.repeat):
+                with replaying(fixtures, args.latency):
+                    tracemalloc.start()
+                    VARIANTS[name](urls)
+                    run_peak = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+                peak = run_peak if peak is None else min(peak, run_peak)
+
+        results["variants"][name] = {"seconds": seconds, "urls_per_second": len(urls) / seconds, "peak_bytes": peak}
+        peak_text = f"{peak / 2 ** 20:8.1f} MiB peak" if peak is not None else ""
+        print(f"{name:<6} {len(urls):>7} URLs  {seconds:8.2f}s  {len(urls) / seconds:>10,.1f} URLs/s  {peak_text}")
+
+    with replaying(fixtures, args.latency):
+        traces = run_traced(urls)
+    stage_names = sorted({stage for trace in traces for stage in trace.stages})
+    results["stages"] = latency_summary(traces, "stages", stage_names)
+    results["features"] = latency_summary(traces, "features", URL_FEATURE_NAMES)
+
+    print(f"\n{'stage / feature':<28} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}  outcomes")
+    for summary in (results["stages"], results["features"]):
+        for name, stats in summary.items():
+            outcomes = ", ".join(f"{outcome} {count}" for outcome, count in sorted(stats["outcomes"].items()))
+            print(f"{name:<28} {stats['p50'] * 1000:9.3f} {stats['p95'] * 1000:9.3f} {stats['max'] * 1000:9.3f}  {outcomes}")
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=1)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = baseline_regressions(results, json.load(file), args.tolerance)
+        if regressions:
+            raise SystemExit(f"{len(regressions)} regressions against {args.baseline}:\n  " + "\n  ".join(regressions))
+        print(f"\nno regression beyond {args.tolerance:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
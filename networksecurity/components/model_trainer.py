@@ -6,14 +6,18 @@ from networksecurity.logging.logger import logging
 
 from networksecurity.entity.artifact_entity import DataTransformationArtifact,ModelTrainerArtifact
 from networksecurity.entity.config_entity import ModelTrainerConfig
+from networksecurity.constant.training_pipeline import SCHEMA_FILE_PATH,TARGET_COLUMN,MODEL_TRAINER_LEXICAL_MODEL_FILE_PATH
+from networksecurity.constant.feature_extractor import LEXICAL_FEATURE_NAMES
 
 
 
-from networksecurity.utils.ml_utils.model.estimator import NetworkModel
-from networksecurity.utils.main_utils.utils import save_object,load_object
+from networksecurity.utils.ml_utils.model.estimator import NetworkModel,LexicalModel
+from networksecurity.utils.ml_utils.model.live_model import write_model_manifest
+from networksecurity.utils.main_utils.utils import save_object,load_object,get_feature_columns
 from networksecurity.utils.main_utils.utils import load_numpy_array_data,evaluate_models
 from networksecurity.utils.ml_utils.metric.classification_metric import get_classification_score
 
+from sklearn.base import clone
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import r2_score
 from sklearn.neighbors import KNeighborsClassifier
@@ -59,6 +63,25 @@ class ModelTrainer:
                 mlflow.sklearn.log_model(best_model, artifact_path="model")
         
     
+    def train_lexical_model(self,best_model,X_train,y_train,x_test,y_test):
+        """
+        Fit a copy of the best model on the lexical (URL-string) feature columns
+        only and save it as the first tier of the /predict_url cascade.
+        """
+        feature_columns = get_feature_columns(SCHEMA_FILE_PATH, TARGET_COLUMN)
+        lexical_columns = [feature_columns.index(name) for name in LEXICAL_FEATURE_NAMES]
+
+        lexical_model = clone(best_model)
+        lexical_model.fit(X_train[:, lexical_columns], y_train)
+
+        y_test_pred = lexical_model.predict(x_test[:, lexical_columns])
+        lexical_test_metric = get_classification_score(y_true=y_test, y_pred=y_test_pred)
+        logging.info(f"Lexical model test metric: {lexical_test_metric}")
+
+        save_object(MODEL_TRAINER_LEXICAL_MODEL_FILE_PATH,
+                    LexicalModel(model=lexical_model, feature_names=LEXICAL_FEATURE_NAMES))
+        return lexical_test_metric
+    
     def train_model(self,X_train,y_train,x_test,y_test):
         models = {
                 "Random Forest": RandomForestClassifier(verbose=1),
@@ -128,6 +151,9 @@ class ModelTrainer:
         save_object(self.model_trainer_config.trained_model_file_path,obj=NetworkModel)
         #model pusher
         save_object("final_model/model.pkl",best_model)
+        self.train_lexical_model(best_model,X_train,y_train,x_test,y_test)
+        # last: the API reloads the artifacts above once the manifest lists them
+        write_model_manifest()
         
 
         ## Model Trainer Artifact
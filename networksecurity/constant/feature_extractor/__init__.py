@@ -0,0 +1,198 @@
+import os
+
+
+"""
+defining common constant variable for the URL feature extractor
+"""
+EXTRACTOR_USER_AGENT: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+EXTRACTOR_REQUEST_TIMEOUT: int = 10
+
+## threads used to run blocking lookups (WHOIS, HTTP, DNS) for the async extractor
+EXTRACTOR_MAX_WORKER_THREADS: int = int(os.getenv("EXTRACTOR_MAX_WORKER_THREADS", 32))
+
+## local directory for the extractor's on-disk caches
+EXTRACTOR_CACHE_DIR: str = os.getenv("EXTRACTOR_CACHE_DIR", "extractor_cache")
+
+## the 30 features in the order of data_schema/schema.yaml
+URL_FEATURE_NAMES: list = [
+    "having_IP_Address", "URL_Length", "Shortining_Service", "having_At_Symbol",
+    "double_slash_redirecting", "Prefix_Suffix", "having_Sub_Domain", "SSLfinal_State",
+    "Domain_registeration_length", "Favicon", "port", "HTTPS_token", "Request_URL",
+    "URL_of_Anchor", "Links_in_tags", "SFH", "Submitting_to_email", "Abnormal_URL",
+    "Redirect", "on_mouseover", "RightClick", "popUpWidnow", "Iframe", "age_of_domain",
+    "DNSRecord", "web_traffic", "Page_Rank", "Google_Index", "Links_pointing_to_page",
+    "Statistical_report",
+]
+
+## public suffix list snapshot shipped in networksecurity/utils/extractor_utils/data
+PUBLIC_SUFFIX_LIST_FILE_NAME: str = "public_suffix_list.dat"
+## URL authorities / hosts whose subdomain, domain and suffix split is memoized
+DOMAIN_SPLIT_CACHE_SIZE: int = int(os.getenv("DOMAIN_SPLIT_CACHE_SIZE", 65536))
+
+
+"""
+HTTP client related constant start with HTTP VAR NAME
+"""
+## hosts with a connection pool kept open, least recently used are dropped first
+HTTP_POOL_CONNECTIONS: int = int(os.getenv("HTTP_POOL_CONNECTIONS", 256))
+## keep-alive connections kept per host
+HTTP_POOL_MAXSIZE: int = int(os.getenv("HTTP_POOL_MAXSIZE", 16))
+## wait for a free connection instead of opening one above HTTP_POOL_MAXSIZE
+HTTP_POOL_BLOCK: bool = os.getenv("HTTP_POOL_BLOCK", "false").lower() == "true"
+HTTP_CONNECT_TIMEOUT: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", 5))
+HTTP_READ_TIMEOUT: float = float(os.getenv("HTTP_READ_TIMEOUT", EXTRACTOR_REQUEST_TIMEOUT))
+
+
+"""
+Page download related constant start with PAGE_DOWNLOAD VAR NAME
+"""
+## bytes of (decompressed) body kept from a page, the rest is never downloaded
+PAGE_DOWNLOAD_MAX_BYTES: int = int(os.getenv("PAGE_DOWNLOAD_MAX_BYTES", 2 * 1024 * 1024))
+## seconds for a whole fetch, through every redirect; the body is cut at it, only headers
+## dripped a few bytes at a time can hold a fetch past it (see fetch_url)
+PAGE_DOWNLOAD_DEADLINE: float = float(os.getenv("PAGE_DOWNLOAD_DEADLINE", 20))
+PAGE_DOWNLOAD_CHUNK_SIZE: int = 64 * 1024
+
+
+"""
+WHOIS cache related constant start with WHOIS_CACHE VAR NAME
+"""
+WHOIS_CACHE_FILE_NAME: str = "whois_cache.sqlite3"
+WHOIS_CACHE_MEMORY_SIZE: int = int(os.getenv("WHOIS_CACHE_MEMORY_SIZE", 4096))
+WHOIS_CACHE_TTL: int = int(os.getenv("WHOIS_CACHE_TTL", 7 * 24 * 60 * 60))
+WHOIS_CACHE_FAILURE_TTL: int = int(os.getenv("WHOIS_CACHE_FAILURE_TTL", 15 * 60))
+
+
+"""
+DNS resolver related constant start with DNS VAR NAME
+"""
+DNS_RESOLVE_TIMEOUT: float = float(os.getenv("DNS_RESOLVE_TIMEOUT", 3))
+DNS_MAX_CONCURRENT_LOOKUPS: int = int(os.getenv("DNS_MAX_CONCURRENT_LOOKUPS", 64))
+DNS_CACHE_SIZE: int = int(os.getenv("DNS_CACHE_SIZE", 10000))
+## record TTLs are clamped to this range before caching
+DNS_CACHE_MIN_TTL: int = 30
+DNS_CACHE_MAX_TTL: int = 60 * 60
+DNS_CACHE_NEGATIVE_TTL: int = int(os.getenv("DNS_CACHE_NEGATIVE_TTL", 5 * 60))
+
+
+"""
+Page digest cache related constant start with PAGE_DIGEST_CACHE VAR NAME
+"""
+## page features memoized by a hash of the page body, shared by identical pages on any domain
+PAGE_DIGEST_CACHE_ENABLED: bool = os.getenv("PAGE_DIGEST_CACHE_ENABLED", "true").lower() == "true"
+PAGE_DIGEST_CACHE_MAX_BYTES: int = int(os.getenv("PAGE_DIGEST_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+PAGE_DIGEST_CACHE_MAX_ENTRIES: int = int(os.getenv("PAGE_DIGEST_CACHE_MAX_ENTRIES", 50000))
+
+
+"""
+Page worker related constant start with PAGE_WORKER VAR NAME
+"""
+## the API parses and scans pages in worker processes instead of the process serving
+## requests; batch runs and the CLIs always parse in their own process. Off by default:
+## spawned workers re-import app and with it model_trainer, which calls dagshub.init,
+## and pages left to them are not parsed while they stream in
+PAGE_WORKERS_ENABLED: bool = os.getenv("PAGE_WORKERS_ENABLED", "false").lower() == "true"
+PAGE_WORKER_PROCESSES: int = int(os.getenv("PAGE_WORKER_PROCESSES", max(1, (os.cpu_count() or 2) // 2)))
+## pages waiting for a worker; beyond that /predict_url sheds the load
+PAGE_WORKER_QUEUE_SIZE: int = int(os.getenv("PAGE_WORKER_QUEUE_SIZE", 16))
+
+
+"""
+Host circuit breaker related constant start with HOST_BREAKER VAR NAME
+"""
+HOST_BREAKER_ENABLED: bool = os.getenv("HOST_BREAKER_ENABLED", "true").lower() == "true"
+## timeouts / connection failures in a row that open the circuit for a host
+HOST_BREAKER_FAILURE_THRESHOLD: int = int(os.getenv("HOST_BREAKER_FAILURE_THRESHOLD", 3))
+## seconds after which an old failure no longer counts
+HOST_BREAKER_FAILURE_WINDOW: int = int(os.getenv("HOST_BREAKER_FAILURE_WINDOW", 10 * 60))
+## seconds a host is skipped once its circuit is open
+HOST_BREAKER_COOLDOWN: int = int(os.getenv("HOST_BREAKER_COOLDOWN", 5 * 60))
+HOST_BREAKER_CACHE_SIZE: int = int(os.getenv("HOST_BREAKER_CACHE_SIZE", 10000))
+
+
+"""
+Feature cache related constant start with FEATURE_CACHE VAR NAME
+"""
+FEATURE_CACHE_ENABLED: bool = os.getenv("FEATURE_CACHE_ENABLED", "true").lower() == "true"
+## features that only depend on the domain are shared by every URL on it
+FEATURE_CACHE_DOMAIN_SIZE: int = int(os.getenv("FEATURE_CACHE_DOMAIN_SIZE", 10000))
+FEATURE_CACHE_DOMAIN_TTL: int = int(os.getenv("FEATURE_CACHE_DOMAIN_TTL", 6 * 60 * 60))
+## domain features computed without a WHOIS record or DNS answer are retried sooner
+FEATURE_CACHE_DOMAIN_FAILURE_TTL: int = int(os.getenv("FEATURE_CACHE_DOMAIN_FAILURE_TTL", 10 * 60))
+## features read from the downloaded page are cached per URL
+FEATURE_CACHE_PAGE_SIZE: int = int(os.getenv("FEATURE_CACHE_PAGE_SIZE", 10000))
+FEATURE_CACHE_PAGE_TTL: int = int(os.getenv("FEATURE_CACHE_PAGE_TTL", 10 * 60))
+
+
+"""
+Feature store related constant start with FEATURE_STORE VAR NAME
+"""
+## extracted features of every URL seen, kept under EXTRACTOR_CACHE_DIR
+FEATURE_STORE_FILE_NAME: str = "feature_store.sqlite3"
+
+
+"""
+Refresh ahead related constant start with REFRESH_AHEAD VAR NAME
+"""
+## refresh hot FeatureCache entries in the background before they expire (API only)
+REFRESH_AHEAD_ENABLED: bool = os.getenv("REFRESH_AHEAD_ENABLED", "true").lower() == "true"
+## seconds between passes over the tracked entries
+REFRESH_AHEAD_INTERVAL: float = float(os.getenv("REFRESH_AHEAD_INTERVAL", 15))
+## entries expiring within this many seconds are refreshed
+REFRESH_AHEAD_LEAD: float = float(os.getenv("REFRESH_AHEAD_LEAD", 60))
+## recent requests that make an entry hot; the counts halve every REFRESH_AHEAD_HALF_LIFE seconds
+REFRESH_AHEAD_MIN_REQUESTS: float = float(os.getenv("REFRESH_AHEAD_MIN_REQUESTS", 3))
+REFRESH_AHEAD_HALF_LIFE: float = float(os.getenv("REFRESH_AHEAD_HALF_LIFE", 10 * 60))
+## refreshes running at once, on their own thread, event loop and lookup threads
+REFRESH_AHEAD_MAX_CONCURRENCY: int = int(os.getenv("REFRESH_AHEAD_MAX_CONCURRENCY", 4))
+REFRESH_AHEAD_MAX_PER_CYCLE: int = int(os.getenv("REFRESH_AHEAD_MAX_PER_CYCLE", 100))
+REFRESH_AHEAD_MAX_TRACKED: int = int(os.getenv("REFRESH_AHEAD_MAX_TRACKED", 10000))
+## live /predict_url extractions in flight at which refreshes are skipped
+REFRESH_AHEAD_MAX_LIVE_REQUESTS: int = int(os.getenv("REFRESH_AHEAD_MAX_LIVE_REQUESTS", 8))
+
+
+"""
+Instrumentation related constant start with INSTRUMENTATION VAR NAME
+"""
+## record per stage / per feature timings for /predict_url and /metrics
+INSTRUMENTATION_ENABLED: bool = os.getenv("INSTRUMENTATION_ENABLED", "false").lower() == "true"
+INSTRUMENTATION_SECONDS_BUCKETS: list = [0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20]
+INSTRUMENTATION_BYTES_BUCKETS: list = [128, 512, 1024, 16 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024]
+
+
+"""
+Domain list related constant start with DOMAIN_LIST VAR NAME
+"""
+## registered domains, one per line, decided without feature extraction
+DOMAIN_LIST_ALLOWLIST_FILE_PATH: str = os.getenv("DOMAIN_LIST_ALLOWLIST_FILE_PATH", os.path.join("domain_lists", "allowlist.txt"))
+DOMAIN_LIST_BLOCKLIST_FILE_PATH: str = os.getenv("DOMAIN_LIST_BLOCKLIST_FILE_PATH", os.path.join("domain_lists", "blocklist.txt"))
+DOMAIN_LIST_ENABLED: bool = os.getenv("DOMAIN_LIST_ENABLED", "true").lower() == "true"
+## Bloom filter false positive rate, every positive is confirmed exactly afterwards
+DOMAIN_LIST_FALSE_POSITIVE_RATE: float = float(os.getenv("DOMAIN_LIST_FALSE_POSITIVE_RATE", 0.001))
+## seconds between checks of the list files for changes
+DOMAIN_LIST_RELOAD_INTERVAL: float = float(os.getenv("DOMAIN_LIST_RELOAD_INTERVAL", 60))
+
+
+"""
+Batch extraction related constant start with BATCH VAR NAME
+"""
+BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", 64))
+## URLs of one registered domain extracted at the same time
+BATCH_PER_DOMAIN_CONCURRENCY: int = int(os.getenv("BATCH_PER_DOMAIN_CONCURRENCY", 4))
+
+
+"""
+Lexical-first prediction cascade related constant start with LEXICAL / PREDICTION_CASCADE VAR NAME
+"""
+## features computed from the URL string alone (1-8, 11 and 12)
+LEXICAL_FEATURE_NAMES: list = [
+    "having_IP_Address", "URL_Length", "Shortining_Service", "having_At_Symbol",
+    "double_slash_redirecting", "Prefix_Suffix", "having_Sub_Domain", "SSLfinal_State",
+    "port", "HTTPS_token",
+]
+PREDICTION_CASCADE_ENABLED: bool = os.getenv("PREDICTION_CASCADE_ENABLED", "true").lower() == "true"
+## the lexical model decides alone when its class probability reaches this value
+PREDICTION_CASCADE_CONFIDENCE_THRESHOLD: float = float(os.getenv("PREDICTION_CASCADE_CONFIDENCE_THRESHOLD", 0.95))
+## seconds /predict_url waits for the network features, unfinished ones are
+## imputed by the preprocessor; 0 waits for every feature
+PREDICTION_TIME_BUDGET: float = float(os.getenv("PREDICTION_TIME_BUDGET", 1.5))
@@ -72,5 +72,18 @@ MODEL_TRAINER_TRAINED_MODEL_DIR: str = "trained_model"
 MODEL_TRAINER_TRAINED_MODEL_NAME: str = "model.pkl"
 MODEL_TRAINER_EXPECTED_SCORE: float = 0.6
 MODEL_TRAINER_OVER_FIITING_UNDER_FITTING_THRESHOLD: float = 0.05
+## first tier of the /predict_url cascade, trained on the lexical features only
+MODEL_TRAINER_LEXICAL_MODEL_FILE_PATH: str = os.path.join("final_model", "lexical_model.pkl")
+
+
+"""
+Model serving related constant start with MODEL_SERVING VAR NAME
+"""
+MODEL_SERVING_PREPROCESSOR_FILE_PATH: str = os.path.join("final_model", "preprocessor.pkl")
+MODEL_SERVING_MODEL_FILE_PATH: str = os.path.join("final_model", "model.pkl")
+## hashes of the artifacts above, written last by the trainer; a new one is what gets reloaded
+MODEL_SERVING_MANIFEST_FILE_PATH: str = os.path.join("final_model", "manifest.json")
+## seconds between checks of the served artifacts for changes
+MODEL_SERVING_RELOAD_INTERVAL: float = float(os.getenv("MODEL_SERVING_RELOAD_INTERVAL", 30))
 
 TRAINING_BUCKET_NAME = "netwworksecurity"
\ No newline at end of file
@@ -0,0 +1,132 @@
+import argparse
+import asyncio
+import sys
+from collections import defaultdict
+
+import pandas as pd
+
+from networksecurity.constant.feature_extractor import BATCH_MAX_CONCURRENCY, BATCH_PER_DOMAIN_CONCURRENCY
+from networksecurity.constant.training_pipeline import SCHEMA_FILE_PATH, TARGET_COLUMN
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.main_utils.utils import get_feature_columns
+from networksecurity.utils.extractor_utils.domain_utils import registered_domain
+from networksecurity.utils.extractor_utils.feature_cache import get_feature_cache
+from networksecurity.utils.extractor_utils.host_breaker import get_host_breaker
+from networksecurity.utils.extractor_utils.page_digest_cache import get_page_digest_cache
+from networksecurity.utils.feature_extractor import _prepare_url, extract_features_from_url_async
+
+
+def _group_key(url: str) -> str:
+    try:
+        return registered_domain(_prepare_url(url)[3])
+    except Exception:
+        return url
+
+
+async def iter_features_batch(urls, ordered: bool = True,
+                              max_concurrency: int = BATCH_MAX_CONCURRENCY,
+                              per_domain_concurrency: int = BATCH_PER_DOMAIN_CONCURRENCY):
+    """
+    Extract features for many URLs concurrently and yield (index, url, features)
+    tuples, in input order when ordered is True or as they finish otherwise.
+
+    URLs are grouped by registered domain. Each group shares its WHOIS and DNS
+    lookups and runs at most per_domain_concurrency extractions at a time, and
+    no more than max_concurrency extractions run across all groups.
+    """
+    urls = list(urls)
+    results = asyncio.Queue()
+    global_limit = asyncio.Semaphore(max_concurrency)
+
+    groups = defaultdict(list)
+    for index, url in enumerate(urls):
+        groups[_group_key(url)].append(index)
+
+    async def run_group(indices):
+        domain_lookups = {}
+        domain_limit = asyncio.Semaphore(per_domain_concurrency)
+
+        async def run_one(index):
+            async with domain_limit, global_limit:
+                try:
+                    features = await extract_features_from_url_async(urls[index], domain_lookups=domain_lookups)
+                except Exception as e:
+                    logging.info(f"Feature extraction failed for {urls[index]}: {e}")
+                    features = [-1] * 30
+            await results.put((index, features))
+
+        await asyncio.gather(*(run_one(index) for index in indices))
+
+    tasks = [asyncio.ensure_future(run_group(indices)) for indices in groups.values()]
+    try:
+        finished = {}
+        next_index = 0
+        for _ in range(len(urls)):
+            index, features = await results.get()
+            if not ordered:
+                yield index, urls[index], features
+                continue
+
+            finished[index] = features
+            while next_index in finished:
+                yield next_index, urls[next_index], finished.pop(next_index)
+                next_index += 1
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def extract_features_batch_async(urls, **kwargs) -> pd.DataFrame:
+    """Collect iter_features_batch into a DataFrame in input order"""
+    urls = list(urls)
+    rows = [None] * len(urls)
+    async for index, _, features in iter_features_batch(urls, ordered=False, **kwargs):
+        rows[index] = features
+
+    dataframe = pd.DataFrame(rows, columns=get_feature_columns(SCHEMA_FILE_PATH, TARGET_COLUMN))
+    dataframe.index = pd.Index(urls, name="url")
+    return dataframe
+
+
+def extract_features_batch(urls, **kwargs) -> pd.DataFrame:
+    """
+    Extract features for a list of URLs. Returns one row per URL, indexed by
+    the URL, with columns in the order of data_schema/schema.yaml.
+    """
+    try:
+        return asyncio.run(extract_features_batch_async(urls, **kwargs))
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract phishing features for a file of URLs, one per line")
+    parser.add_argument("input", help="text file with one URL per line")
+    parser.add_argument("-o", "--output", default="url_features.csv", help="CSV file to write")
+    parser.add_argument("--max-concurrency", type=int, default=BATCH_MAX_CONCURRENCY)
+    parser.add_argument("--per-domain-concurrency", type=int, default=BATCH_PER_DOMAIN_CONCURRENCY)
+    parser.add_argument("--with-url", action="store_true", help="keep the URL as the first column")
+    args = parser.parse_args()
+
+    with open(args.input) as file:
+        urls = [line.strip() for line in file if line.strip()]
+
+    dataframe = extract_features_batch(
+        urls,
+        max_concurrency=args.max_concurrency,
+        per_domain_concurrency=args.per_domain_concurrency,
+    )
+    dataframe.to_csv(args.output, index=args.with_url)
+    print(f"Wrote features for {len(dataframe)} URLs to {args.output}")
+    for scope, stats in get_feature_cache().stats().items():
+        print(f"{scope} feature cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate)")
+    digest_stats = get_page_digest_cache().stats()
+    print(f"page digest cache: {digest_stats['hits']} hits, {digest_stats['misses']} misses "
+          f"({digest_stats['hit_rate']:.0%} hit rate), {digest_stats['bytes'] / 2 ** 20:.1f} MiB")
+    breaker_stats = get_host_breaker().stats()
+    print(f"host circuit breaker: {breaker_stats['size']} hosts open, {breaker_stats['hits']} fetches skipped")
+
+
+if __name__ == "__main__":
+    main()
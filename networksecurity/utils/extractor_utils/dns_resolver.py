@@ -0,0 +1,117 @@
+import asyncio
+import ipaddress
+import socket
+import threading
+import weakref
+
+import dns.asyncresolver
+import dns.resolver
+
+from networksecurity.constant.feature_extractor import (
+    DNS_RESOLVE_TIMEOUT,
+    DNS_MAX_CONCURRENT_LOOKUPS,
+    DNS_CACHE_SIZE,
+    DNS_CACHE_MIN_TTL,
+    DNS_CACHE_MAX_TTL,
+    DNS_CACHE_NEGATIVE_TTL,
+)
+from networksecurity.utils.extractor_utils.ttl_cache import TTLCache, MISSING
+
+
+class DnsResolver:
+    """
+    Non-blocking IPv4 resolution for the extractor.
+
+    Answers are cached for the TTL of the returned records (clamped to
+    [min_ttl, max_ttl]); names that do not resolve or time out are cached
+    as an empty tuple for negative_ttl. At most max_concurrency lookups are
+    in flight per event loop. The size of the DNS response behind each
+    cached answer is kept alongside it, see response_size.
+    """
+
+    def __init__(self, timeout: float = DNS_RESOLVE_TIMEOUT, max_concurrency: int = DNS_MAX_CONCURRENT_LOOKUPS,
+                 cache_size: int = DNS_CACHE_SIZE, min_ttl: float = DNS_CACHE_MIN_TTL,
+                 max_ttl: float = DNS_CACHE_MAX_TTL, negative_ttl: float = DNS_CACHE_NEGATIVE_TTL):
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.negative_ttl = negative_ttl
+        self.cache = TTLCache(maxsize=cache_size, ttl=negative_ttl)
+        self.response_sizes = TTLCache(maxsize=cache_size, ttl=negative_ttl)
+        self._semaphores = weakref.WeakKeyDictionary()
+
+        try:
+            self._resolver = dns.asyncresolver.Resolver()
+        except dns.resolver.NoResolverConfiguration:
+            # no usable resolv.conf, fall back to the system resolver
+            self._resolver = None
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    def cached_addresses(self, host: str):
+        """Addresses already resolved for host, or None if it is not cached"""
+        value = self.cache.get(host)
+        return None if value is MISSING else value
+
+    def response_size(self, host: str):
+        """
+        Bytes of the DNS response the cached addresses of host came from,
+        None when there was none: IP addresses, the system resolver and
+        failed lookups.
+        """
+        value = self.response_sizes.get(host)
+        return None if value is MISSING else value
+
+    async def _query(self, host: str):
+        if self._resolver is None:
+            loop = asyncio.get_running_loop()
+            infos = await asyncio.wait_for(
+                loop.getaddrinfo(host, None, family=socket.AF_INET, type=socket.SOCK_STREAM),
+                timeout=self.timeout,
+            )
+            return tuple(dict.fromkeys(info[4][0] for info in infos)), self.negative_ttl, None
+
+        answer = await self._resolver.resolve(host, "A", lifetime=self.timeout)
+        ttl = min(max(answer.rrset.ttl, self.min_ttl), self.max_ttl)
+        return tuple(record.address for record in answer), ttl, len(answer.response.to_wire())
+
+    async def resolve(self, host: str) -> tuple:
+        """IPv4 addresses of host, an empty tuple if it has no A record"""
+        try:
+            return (str(ipaddress.IPv4Address(host)),)
+        except ValueError:
+            pass
+
+        addresses = self.cache.get(host)
+        if addresses is not MISSING:
+            return addresses
+
+        async with self._semaphore():
+            try:
+                addresses, ttl, size = await self._query(host)
+            except Exception:
+                addresses, ttl, size = (), self.negative_ttl, None
+
+        self.cache.set(host, addresses, ttl=ttl)
+        self.response_sizes.set(host, size, ttl=ttl)
+        return addresses
+
+
+_dns_resolver = None
+_dns_resolver_lock = threading.Lock()
+
+
+def get_dns_resolver() -> DnsResolver:
+    """Process wide DnsResolver shared by DNSRecord and the HTTP fetcher"""
+    global _dns_resolver
+    if _dns_resolver is None:
+        with _dns_resolver_lock:
+            if _dns_resolver is None:
+                _dns_resolver = DnsResolver()
+    return _dns_resolver
@@ -0,0 +1,255 @@
+from collections import Counter
+
+from lxml import etree
+
+
+"""
+Page-derived features computed from a single parse of the fetched document.
+Feature numbers follow the order used by extract_features_from_url.
+"""
+DOM_FEATURE_NAMES = ["Favicon", "Request_URL", "URL_of_Anchor", "Links_in_tags", "SFH", "Iframe"]
+
+# values used when there is no page or it could not be parsed
+DOM_FEATURE_FALLBACKS = {
+    "Favicon": -1,
+    "Request_URL": -1,
+    "URL_of_Anchor": -1,
+    "Links_in_tags": -1,
+    "SFH": -1,
+    "Iframe": 1,
+}
+
+REQUEST_URL_TAGS = {"img", "script", "link", "iframe", "embed", "object"}
+LINKS_IN_TAGS_TAGS = {"meta", "script", "link"}
+SUSPICIOUS_ANCHOR_HREFS = {"#", "javascript:void(0)", "javascript:;", ""}
+
+
+class DomDigestCollector:
+    """
+    lxml parser target that walks every element once and keeps what features
+    10, 13, 14, 15, 16 and 23 need without reference to the page's domain:
+    the counters, and the absolute (http...) URLs that are external or not
+    depending on it. features(domain) scores the digest for any domain, so
+    one digest serves every copy of a page served from many domains.
+    """
+
+    def __init__(self):
+        self.favicon_links = 0
+        self.favicon_urls = []
+
+        self.total_requests = 0
+        self.request_urls = Counter()
+
+        self.total_tags = 0
+        # absolute content/src/href values of one tag -> tags having them
+        self.tag_urls = Counter()
+
+        self.total_anchors = 0
+        self.placeholder_anchors = 0
+        self.anchor_urls = Counter()
+
+        self.total_forms = 0
+        # empty, "#" or mailto: action, suspicious on any domain
+        self.suspicious_form = False
+        self.form_urls = Counter()
+
+        self.total_iframes = 0
+        self.suspicious_iframes = 0
+
+    def start(self, tag, attrib):
+        if tag == 'link':
+            rel = attrib.get('rel')
+            if rel and 'icon' in rel.lower():
+                self.favicon_links += 1
+                href = attrib.get('href', '')
+                if href.startswith('http'):
+                    self.favicon_urls.append(href)
+
+        if tag in REQUEST_URL_TAGS:
+            src = attrib.get('src') or attrib.get('href')
+            if src:
+                self.total_requests += 1
+                if src.startswith('http'):
+                    self.request_urls[src] += 1
+
+        if tag in LINKS_IN_TAGS_TAGS:
+            self.total_tags += 1
+            values = tuple(value for value in (attrib.get(attr, '') for attr in ['content', 'src', 'href'])
+                           if value.startswith('http'))
+            if values:
+                self.tag_urls[values] += 1
+
+        if tag == 'a' and 'href' in attrib:
+            href = attrib.get('href', '')
+            self.total_anchors += 1
+            if href in SUSPICIOUS_ANCHOR_HREFS:
+                self.placeholder_anchors += 1
+            elif href.startswith('http'):
+                self.anchor_urls[href] += 1
+
+        elif tag == 'form':
+            action = attrib.get('action', '')
+            self.total_forms += 1
+            if action == '' or action == '#' or 'mailto:' in action:
+                self.suspicious_form = True
+            elif action.startswith('http'):
+                self.form_urls[action] += 1
+
+        elif tag == 'iframe':
+            width = attrib.get('width', '100')
+            height = attrib.get('height', '100')
+            style = attrib.get('style', '').replace(' ', '')
+            self.total_iframes += 1
+            # invisible iframes
+            if (width in ['0', '1'] or height in ['0', '1'] or
+                    'display:none' in style or 'visibility:hidden' in style):
+                self.suspicious_iframes += 1
+
+    def end(self, tag):
+        pass
+
+    def data(self, data):
+        pass
+
+    def comment(self, text):
+        pass
+
+    def close(self):
+        return self
+
+    @property
+    def nbytes(self) -> int:
+        """Rough memory taken by the digest, for caches bounded in bytes"""
+        urls = (self.favicon_urls, self.request_urls, self.anchor_urls, self.form_urls)
+        size = sum(len(url) + 64 for values in urls for url in values)
+        return 512 + size + sum(sum(len(url) for url in values) + 64 for values in self.tag_urls)
+
+    def features(self, domain: str) -> dict:
+        """Features 10, 13-16 and 23 of the page when it is served from domain"""
+
+        def external(urls) -> int:
+            # the absolute URLs not mentioning domain, weighted by their count
+            if isinstance(urls, Counter):
+                return sum(count for url, count in urls.items() if domain not in url)
+            return sum(1 for url in urls if domain not in url)
+
+        return {
+            "Favicon": self.favicon(external(self.favicon_urls) > 0),
+            "Request_URL": self.request_url(external(self.request_urls)),
+            "URL_of_Anchor": self.url_of_anchor(self.placeholder_anchors + external(self.anchor_urls)),
+            "Links_in_tags": self.links_in_tags(sum(
+                count for values, count in self.tag_urls.items() if any(domain not in value for value in values)
+            )),
+            "SFH": self.sfh(self.suspicious_form or external(self.form_urls) > 0),
+            "Iframe": self.iframe(),
+        }
+
+    def favicon(self, external_favicon: bool) -> int:
+        """10. Check favicon source"""
+        if not self.favicon_links:
+            return -1  # No favicon
+        return -1 if external_favicon else 1
+
+    def request_url(self, external_requests: int) -> int:
+        """13. Check percentage of external requests"""
+        if self.total_requests == 0:
+            return 1
+
+        external_percentage = external_requests / self.total_requests
+        if external_percentage < 0.22:
+            return 1   # Low external requests - legitimate
+        elif external_percentage < 0.61:
+            return 0   # Medium external requests - suspicious
+        else:
+            return -1  # High external requests - phishing
+
+    def url_of_anchor(self, suspicious_anchors: int) -> int:
+        """14. Check anchor URLs"""
+        if self.total_anchors == 0:
+            return 1
+
+        suspicious_percentage = suspicious_anchors / self.total_anchors
+        if suspicious_percentage < 0.31:
+            return 1   # Few suspicious anchors - legitimate
+        elif suspicious_percentage < 0.67:
+            return 0   # Some suspicious anchors - suspicious
+        else:
+            return -1  # Many suspicious anchors - phishing
+
+    def links_in_tags(self, external_tags: int) -> int:
+        """15. Check links in meta, script, and link tags"""
+        if self.total_tags == 0:
+            return 1
+
+        external_percentage = external_tags / self.total_tags
+        if external_percentage < 0.17:
+            return 1   # Few external links - legitimate
+        elif external_percentage < 0.81:
+            return 0   # Some external links - suspicious
+        else:
+            return -1  # Many external links - phishing
+
+    def sfh(self, suspicious_form: bool) -> int:
+        """16. Server Form Handler - Check form actions"""
+        if self.total_forms == 0:
+            return 1  # No forms
+        return -1 if suspicious_form else 1
+
+    def iframe(self) -> int:
+        """23. Check for iframe usage"""
+        if self.suspicious_iframes == 0:
+            return 1   # No suspicious iframes
+        elif self.suspicious_iframes <= self.total_iframes // 2:
+            return 0   # Some suspicious iframes
+        else:
+            return -1  # Many suspicious iframes
+
+
+class DomDigestParser:
+    """
+    Incremental version of extract_dom_digest: feed the page as it arrives
+    and call close() for its DomDigestCollector. Errors at any point end in
+    None, which dom_digest_features gives the fallbacks for.
+    """
+
+    def __init__(self):
+        self._parser = etree.HTMLParser(target=DomDigestCollector())
+        self._failed = False
+
+    def feed(self, text: str) -> None:
+        if self._failed or not text:
+            return
+        try:
+            self._parser.feed(text)
+        except Exception:
+            self._failed = True
+
+    def close(self):
+        # nothing fed makes close() fail as well
+        if self._failed:
+            return None
+        try:
+            return self._parser.close()
+        except Exception:
+            return None
+
+
+def extract_dom_digest(page_content: str):
+    """
+    Parse page_content once with lxml and return its DomDigestCollector,
+    or None when it could not be parsed (dom_digest_features gives the
+    fallbacks for it).
+    """
+    parser = DomDigestParser()
+    parser.feed(page_content)
+    return parser.close()
+
+
+def dom_digest_features(digest, domain: str) -> dict:
+    """Features of a digest from extract_dom_digest for domain"""
+    if digest is None:
+        return dict(DOM_FEATURE_FALLBACKS)
+    try:
+        return digest.features(domain)
+    except Exception:
+        return dict(DOM_FEATURE_FALLBACKS)
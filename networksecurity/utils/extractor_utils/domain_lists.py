@@ -0,0 +1,234 @@
+import hashlib
+import math
+import os
+import re
+import threading
+import time
+from typing import Optional
+from urllib.parse import unquote, urlsplit
+
+import numpy as np
+
+from networksecurity.constant.feature_extractor import (
+    DOMAIN_LIST_ALLOWLIST_FILE_PATH,
+    DOMAIN_LIST_BLOCKLIST_FILE_PATH,
+    DOMAIN_LIST_FALSE_POSITIVE_RATE,
+    DOMAIN_LIST_RELOAD_INTERVAL,
+)
+from networksecurity.logging.logger import logging
+from networksecurity.utils.extractor_utils.domain_utils import split_domain
+
+# verdicts of DomainLists.check
+VERDICT_ALLOW = "allowlist"
+VERDICT_BLOCK = "blocklist"
+
+# the C0 controls and space browsers strip around a URL
+_URL_STRIPPED_CHARACTERS = "".join(map(chr, range(0x21)))
+# the ASCII tab and newlines browsers drop anywhere in a URL
+_URL_DROPPED_CHARACTERS = str.maketrans("", "", "\t\n\r")
+_SPECIAL_URL_PATTERN = re.compile(r"^(https?):[/\\]*([^/\\?#]*)", re.IGNORECASE)
+_HTTP_SCHEME_PATTERN = re.compile(r"^https?:", re.IGNORECASE)
+_HOSTNAME_PATTERN = re.compile(r"^[a-z0-9-]+(\.[a-z0-9-]+)*\.?$")
+
+
+def list_key(value: str) -> str:
+    """
+    Registered domain of a URL or host name, the host itself for IP
+    addresses. Sites under a hosting provider's suffix (user.github.io) are
+    registered domains of their own, so listing one never lists its
+    neighbours, and the provider's suffix alone is no key.
+    """
+    ext = split_domain(value, include_psl_private_domains=True)
+    return (f"{ext.domain}.{ext.suffix}" if ext.domain and ext.suffix else ext.domain).lower()
+
+
+def browser_host(url: str) -> Optional[str]:
+    """
+    Host a browser opens for an http(s) URL, parsed as the WHATWG URL
+    standard does: a backslash ends the authority like a slash, and the
+    userinfo ends at its last @. None for other URLs and for hosts that are
+    not plain ASCII host names, which the URL standard would reject or
+    IDNA-encode.
+    """
+    url = url.strip(_URL_STRIPPED_CHARACTERS).translate(_URL_DROPPED_CHARACTERS)
+    match = _SPECIAL_URL_PATTERN.match(url)
+    if match is None:
+        return None
+    host, _, port = match.group(2).rpartition("@")[2].partition(":")
+    host = unquote(host).lower()
+    if not _HOSTNAME_PATTERN.match(host) or port and not port.isdigit():
+        return None
+    return host
+
+
+def with_scheme(url: str) -> str:
+    """url with http:// in front when it has no http(s) scheme, as the extractor and browsers read it"""
+    url = url.strip(_URL_STRIPPED_CHARACTERS)
+    return url if _HTTP_SCHEME_PATTERN.match(url) else "http://" + url
+
+
+def _domain_hash(domain: str) -> tuple:
+    """64-bit fingerprint of domain and two 64-bit values for the Bloom filter probes"""
+    digest = hashlib.blake2b(domain.encode("utf-8"), digest_size=24).digest()
+    return (int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:16], "little"),
+            int.from_bytes(digest[16:], "little") | 1)
+
+
+class DomainSet:
+    """
+    Read-only set of domains in two compact structures: a Bloom filter that
+    rejects almost every domain not in the set after a few bit probes, and a
+    sorted array of 64-bit fingerprints that confirms the rest exactly (up to
+    a fingerprint collision, about n / 2**64). Takes roughly
+    8 + 1.44 * log2(1 / false_positive_rate) / 8 bytes per domain.
+    """
+
+    def __init__(self, domains, false_positive_rate: float = DOMAIN_LIST_FALSE_POSITIVE_RATE):
+        hashes = np.array([_domain_hash(domain) for domain in set(domains)], dtype=np.uint64).reshape(-1, 3)
+        self.fingerprints = np.unique(hashes[:, 0])
+
+        # optimal size and probe count for the expected false positive rate
+        count = max(len(hashes), 1)
+        self.bit_count = max(64, math.ceil(-count * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.probe_count = max(1, round(self.bit_count / count * math.log(2)))
+
+        # the probes of every domain at once, as in _positions; the operands
+        # are reduced modulo bit_count first so nothing overflows 64 bits
+        bit_count = np.uint64(self.bit_count)
+        first = hashes[:, 1] % bit_count
+        step = hashes[:, 2] % bit_count
+        bits = np.zeros(self.bit_count, dtype=bool)
+        for probe in range(self.probe_count):
+            bits[(first + np.uint64(probe) * step) % bit_count] = True
+        # bytes indexing is the fastest single bit probe from Python
+        self.bits = np.packbits(bits, bitorder="little").tobytes()
+
+    def _positions(self, first: int, step: int):
+        first %= self.bit_count
+        step %= self.bit_count
+        return ((first + probe * step) % self.bit_count for probe in range(self.probe_count))
+
+    def __len__(self) -> int:
+        return len(self.fingerprints)
+
+    def __contains__(self, domain: str) -> bool:
+        fingerprint, first, step = _domain_hash(domain)
+        for position in self._positions(first, step):
+            if not self.bits[position >> 3] >> (position & 7) & 1:
+                return False
+        index = np.searchsorted(self.fingerprints, np.uint64(fingerprint))
+        return index < len(self.fingerprints) and int(self.fingerprints[index]) == fingerprint
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.bits) + self.fingerprints.nbytes
+
+
+def read_domain_file(file_path: str) -> list:
+    """
+    Registered domains listed in file_path, one per line. Blank lines and
+    lines starting with # are skipped; URLs and host names are reduced to
+    their list_key.
+    """
+    domains = []
+    with open(file_path, encoding="utf-8", errors="replace") as file:
+        for line in file:
+            entry = line.strip()
+            if not entry or entry.startswith("#"):
+                continue
+            domain = list_key(entry)
+            if domain:
+                domains.append(domain)
+    return domains
+
+
+class DomainLists:
+    """
+    Local allow- and blocklists of registered domains checked before feature
+    extraction. A domain on the blocklist wins over the allowlist.
+
+    Each list is a DomainSet loaded from its file. The files are checked for
+    changes at most every reload_interval seconds and reloaded in the
+    background of the next check; reload() does it at once. A list whose file
+    does not exist is empty.
+    """
+
+    def __init__(self, allowlist_file_path: str = DOMAIN_LIST_ALLOWLIST_FILE_PATH,
+                 blocklist_file_path: str = DOMAIN_LIST_BLOCKLIST_FILE_PATH,
+                 reload_interval: float = DOMAIN_LIST_RELOAD_INTERVAL):
+        self.file_paths = {VERDICT_BLOCK: blocklist_file_path, VERDICT_ALLOW: allowlist_file_path}
+        self.reload_interval = reload_interval
+        self.lists = {verdict: DomainSet([]) for verdict in self.file_paths}
+        self._mtimes = {verdict: None for verdict in self.file_paths}
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.reload()
+
+    def _mtime(self, verdict: str) -> Optional[float]:
+        try:
+            return os.stat(self.file_paths[verdict]).st_mtime
+        except OSError:
+            return None
+
+    def reload(self, force: bool = True) -> dict:
+        """Load the lists whose file changed (every list when force), returns the list sizes"""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            for verdict, file_path in self.file_paths.items():
+                mtime = self._mtime(verdict)
+                if not force and mtime == self._mtimes[verdict]:
+                    continue
+                try:
+                    domains = read_domain_file(file_path) if mtime is not None else []
+                except Exception as e:
+                    logging.info(f"Keeping the loaded {verdict}, reading {file_path} failed: {e}")
+                    continue
+                # built aside and swapped in, lookups never see a half loaded list
+                self.lists[verdict] = DomainSet(domains)
+                self._mtimes[verdict] = mtime
+                logging.info(f"Loaded {len(self.lists[verdict])} domains into the {verdict} from {file_path}")
+            return {verdict: len(domain_set) for verdict, domain_set in self.lists.items()}
+
+    def _reload_if_due(self) -> None:
+        if time.monotonic() - self._checked_at < self.reload_interval or self._lock.locked():
+            return
+        self._checked_at = time.monotonic()
+        threading.Thread(target=self.reload, kwargs={"force": False}, daemon=True).start()
+
+    def check(self, url: str) -> Optional[str]:
+        """
+        VERDICT_BLOCK or VERDICT_ALLOW when the URL's registered domain is
+        listed, else None. URLs whose host a browser reads differently from
+        urlparse (http://evil.com\\@paypal.com/) or that is no plain host
+        name are never listed: they go to the model. URLs without a scheme
+        are read as http URLs, like the extractor reads them.
+        """
+        self._reload_if_due()
+        try:
+            url = with_scheme(url)
+            host = browser_host(url)
+            if host is None or host != (urlsplit(url).hostname or "").lower():
+                return None
+            domain = list_key(host)
+        except Exception:
+            return None
+        if not domain:
+            return None
+        for verdict, domain_set in self.lists.items():
+            if domain in domain_set:
+                return verdict
+        return None
+
+
+_domain_lists = None
+_domain_lists_lock = threading.Lock()
+
+
+def get_domain_lists() -> DomainLists:
+    """Process wide DomainLists read from DOMAIN_LIST_ALLOWLIST/BLOCKLIST_FILE_PATH"""
+    global _domain_lists
+    if _domain_lists is None:
+        with _domain_lists_lock:
+            if _domain_lists is None:
+                _domain_lists = DomainLists()
+    return _domain_lists
@@ -0,0 +1,54 @@
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+
+import tldextract
+
+from networksecurity.constant.feature_extractor import PUBLIC_SUFFIX_LIST_FILE_NAME, DOMAIN_SPLIT_CACHE_SIZE
+
+PUBLIC_SUFFIX_LIST_FILE_PATH = os.path.join(os.path.dirname(__file__), "data", PUBLIC_SUFFIX_LIST_FILE_NAME)
+
+# Built from the snapshot shipped with the package: no cache directory and no
+# suffix list download, so splitting a domain never touches the network or
+# writes to disk. The snapshot is read once, below, at import.
+_suffix_extractor = tldextract.TLDExtract(
+    cache_dir=None,
+    suffix_list_urls=(Path(PUBLIC_SUFFIX_LIST_FILE_PATH).resolve().as_uri(),),
+    fallback_to_snapshot=False,
+)
+_suffix_extractor("example.com")
+
+# tldextract only looks at the authority of http(s) URLs
+_AUTHORITY_PATTERN = re.compile(r'^https?://([^/?#]*)')
+
+
+@lru_cache(maxsize=DOMAIN_SPLIT_CACHE_SIZE)
+def _split(value: str, include_psl_private_domains: bool):
+    return _suffix_extractor(value, include_psl_private_domains=include_psl_private_domains)
+
+
+def split_domain(url: str, include_psl_private_domains: bool = False):
+    """
+    Subdomain, domain and suffix of a URL or host, like tldextract.extract but
+    against the shipped suffix list snapshot. Splits are memoized per
+    authority, so every URL on one host shares an entry.
+
+    With include_psl_private_domains, suffixes registered by hosting
+    providers (github.io, blogspot.com) count as public suffixes, so every
+    site hosted under one is a registered domain of its own.
+    """
+    match = _AUTHORITY_PATTERN.match(url)
+    return _split('//' + match.group(1) if match else url, include_psl_private_domains)
+
+
+def registered_domain(host: str) -> str:
+    """
+    Registered domain of host according to the public suffix list
+    (login.example.co.uk -> example.co.uk). Hosts without one, such as IP
+    addresses or localhost, are returned unchanged.
+    """
+    ext = split_domain(host)
+    if ext.domain and ext.suffix:
+        return f"{ext.domain}.{ext.suffix}"
+    return host
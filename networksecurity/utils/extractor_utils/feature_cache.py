@@ -0,0 +1,88 @@
+import threading
+from typing import Optional
+
+from networksecurity.constant.feature_extractor import (
+    FEATURE_CACHE_DOMAIN_SIZE,
+    FEATURE_CACHE_DOMAIN_TTL,
+    FEATURE_CACHE_DOMAIN_FAILURE_TTL,
+    FEATURE_CACHE_PAGE_SIZE,
+    FEATURE_CACHE_PAGE_TTL,
+)
+from networksecurity.utils.extractor_utils.ttl_cache import TTLCache, MISSING
+
+
+class FeatureCache:
+    """
+    Computed feature values in two scopes:
+
+    - domain: features that only depend on the domain (WHOIS, DNS) keyed by
+      domain, shared by every URL on it for domain_ttl (domain_failure_ttl
+      when the WHOIS or DNS lookup behind them failed)
+    - page: features read from the page or its redirects keyed by URL for
+      page_ttl
+
+    Values are dicts of feature name to value; FeatureProvider.scope tells
+    which scope a feature belongs to. Features computed from the URL string
+    alone are cheap and not cached.
+    """
+
+    def __init__(self, domain_size: int = FEATURE_CACHE_DOMAIN_SIZE, domain_ttl: float = FEATURE_CACHE_DOMAIN_TTL,
+                 domain_failure_ttl: float = FEATURE_CACHE_DOMAIN_FAILURE_TTL,
+                 page_size: int = FEATURE_CACHE_PAGE_SIZE, page_ttl: float = FEATURE_CACHE_PAGE_TTL):
+        self.domain_failure_ttl = domain_failure_ttl
+        self.scopes = {
+            "domain": TTLCache(maxsize=domain_size, ttl=domain_ttl),
+            "page": TTLCache(maxsize=page_size, ttl=page_ttl),
+        }
+
+    def get(self, scope: str, key: str) -> Optional[dict]:
+        values = self.scopes[scope].get(key)
+        return None if values is MISSING else values
+
+    def set(self, scope: str, key: str, values: dict, ttl: float = None) -> None:
+        self.scopes[scope].set(key, values, ttl=ttl)
+
+    def expires_at(self, scope: str, key: str) -> Optional[float]:
+        return self.scopes[scope].expires_at(key)
+
+    def set_domain(self, domain: str, values: dict, complete: bool = True) -> None:
+        self.set("domain", domain, values, ttl=None if complete else self.domain_failure_ttl)
+
+    def set_page(self, url: str, values: dict) -> None:
+        self.set("page", url, values)
+
+    def clear(self) -> None:
+        for cache in self.scopes.values():
+            cache.clear()
+
+    def stats(self) -> dict:
+        """size, hits, misses and hit_rate of each scope"""
+        return {scope: cache.stats() for scope, cache in self.scopes.items()}
+
+    def render_metrics(self) -> list:
+        """Lookups and sizes of each scope in the Prometheus text format, see instrumentation.render_metrics"""
+        stats = self.stats()
+        name = "extractor_feature_cache_lookups_total"
+        lines = [f"# HELP {name} FeatureCache lookups by scope and result", f"# TYPE {name} counter"]
+        for scope, scope_stats in stats.items():
+            for result, key in (("hit", "hits"), ("miss", "misses")):
+                lines.append(f'{name}{{scope="{scope}",result="{result}"}} {scope_stats[key]}')
+        name = "extractor_feature_cache_entries"
+        lines += [f"# HELP {name} FeatureCache entries by scope", f"# TYPE {name} gauge"]
+        for scope, scope_stats in stats.items():
+            lines.append(f'{name}{{scope="{scope}"}} {scope_stats["size"]}')
+        return lines
+
+
+_feature_cache = None
+_feature_cache_lock = threading.Lock()
+
+
+def get_feature_cache() -> FeatureCache:
+    """Process wide FeatureCache used by extract_features_from_url_async"""
+    global _feature_cache
+    if _feature_cache is None:
+        with _feature_cache_lock:
+            if _feature_cache is None:
+                _feature_cache = FeatureCache()
+    return _feature_cache
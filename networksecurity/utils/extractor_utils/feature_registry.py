@@ -0,0 +1,137 @@
+import hashlib
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from networksecurity.utils.extractor_utils.instrumentation import NO_TRACE
+from networksecurity.utils.extractor_utils.page_digest_cache import page_hash
+
+# resources a feature can read, see FeatureContext
+RESOURCE_URL = "url"              # the URL string and its parsed form
+RESOURCE_DOMAIN = "domain"        # the host name alone, nothing looked up
+RESOURCE_WHOIS = "whois"          # WHOIS record of the registered domain
+RESOURCE_DNS = "dns"              # IPv4 addresses of the domain
+RESOURCE_PAGE = "page"            # downloaded body of the final response
+RESOURCE_REDIRECTS = "redirects"  # redirect chain and final status, body not needed
+
+# resources that cost a lookup or a download; URL and DOMAIN are free
+NETWORK_RESOURCES = frozenset({RESOURCE_WHOIS, RESOURCE_DNS, RESOURCE_PAGE, RESOURCE_REDIRECTS})
+
+
+@dataclass
+class FeatureContext:
+    """
+    What the features of one URL are computed from. The scheduler fills in
+    only the resources the requested features declared; the others stay None.
+    """
+    url: str
+    parsed_url: object
+    domain: str
+    clean_domain: str
+    whois_info: object = None
+    addresses: Optional[tuple] = None
+    fetch_result: object = None
+    trace: object = NO_TRACE
+    # content hash of the page, computed by the first page provider needing it
+    page_hash: Optional[bytes] = None
+    # PAGE_ANALYSES results the worker processes already computed for the page
+    page_analysis: dict = field(default_factory=dict)
+
+    def available(self, resource: str) -> bool:
+        """False when the lookup behind resource failed and features fall back to placeholders"""
+        if resource == RESOURCE_WHOIS:
+            return self.whois_info is not None
+        if resource == RESOURCE_PAGE:
+            return self.fetch_result is not None and bool(self.fetch_result.page_content)
+        if resource == RESOURCE_REDIRECTS:
+            return self.fetch_result is not None and self.fetch_result.ok
+        # an empty DNS answer is an answer
+        return True
+
+    def resource_hashes(self) -> dict:
+        """Resource -> hex hash of its content, for the network resources that were looked up"""
+        contents = {}
+        if self.whois_info is not None:
+            contents[RESOURCE_WHOIS] = str(getattr(self.whois_info, "text", self.whois_info)).encode("utf-8", "replace")
+        if self.addresses is not None:
+            contents[RESOURCE_DNS] = ",".join(sorted(self.addresses)).encode("ascii", "replace")
+        if self.fetch_result is not None:
+            fetch_result = self.fetch_result
+            contents[RESOURCE_REDIRECTS] = repr(
+                (fetch_result.error, fetch_result.status_code, fetch_result.final_url, fetch_result.redirect_chain)
+            ).encode("utf-8", "replace")
+        hashes = {resource: hashlib.blake2b(content, digest_size=16).hexdigest() for resource, content in contents.items()}
+        if self.fetch_result is not None and self.fetch_result.page_content:
+            if self.page_hash is None:
+                self.page_hash = page_hash(self.fetch_result.page_content)
+            hashes[RESOURCE_PAGE] = self.page_hash.hex()
+        return hashes
+
+
+@dataclass(frozen=True)
+class FeatureProvider:
+    """
+    Computes one or more features in one call: compute(context) returns a
+    dict of feature name to value. Features computed by the same pass over
+    a resource (the DOM parse, the page text scan) share a provider.
+
+    placeholder: the provider has no data source and always returns its
+    fallback value.
+
+    version: bumped whenever compute changes what it returns, so the values
+    a FeatureStore holds from older versions are recomputed.
+    """
+    names: tuple
+    resources: frozenset
+    compute: Callable
+    placeholder: bool = False
+    version: int = 1
+
+    @property
+    def scope(self) -> Optional[str]:
+        """FeatureCache scope of the values: page, domain, or None when they depend on the URL string"""
+        if self.resources & {RESOURCE_PAGE, RESOURCE_REDIRECTS}:
+            return "page"
+        if RESOURCE_URL not in self.resources:
+            return "domain"
+        return None
+
+
+@dataclass
+class FeatureRegistry:
+    """
+    Feature name to FeatureProvider. The 30 model features are registered by
+    networksecurity.utils.feature_extractor; experiments register their own
+    with register() and request them by name.
+    """
+    providers: dict = field(default_factory=dict)
+
+    def register(self, names, resources, compute: Callable, placeholder: bool = False,
+                 version: int = 1) -> FeatureProvider:
+        """
+        Register compute for names. With a single name, compute may return the
+        value itself instead of a dict.
+        """
+        if isinstance(names, str):
+            name = names
+            names = (name,)
+            single = compute
+            compute = lambda context: {name: single(context)}
+        provider = FeatureProvider(tuple(names), frozenset(resources), compute, placeholder, version)
+        for name in provider.names:
+            self.providers[name] = provider
+        return provider
+
+    def providers_for(self, names) -> list:
+        """Providers computing names, each once, in the order of names; KeyError for unknown names"""
+        providers = {}
+        for name in names:
+            provider = self.providers[name]
+            providers[id(provider)] = provider
+        return list(providers.values())
+
+    def versions(self, names) -> dict:
+        """Feature name -> version of the provider computing it"""
+        return {name: self.providers[name].version for name in names}
+
+
+FEATURE_REGISTRY = FeatureRegistry()
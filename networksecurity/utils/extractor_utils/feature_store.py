@@ -0,0 +1,281 @@
+"""
+Persistent store of the extracted features of every URL seen, so retraining
+and re-scoring do not extract them again.
+
+    python -m networksecurity.utils.extractor_utils.feature_store materialize urls.txt
+    python -m networksecurity.utils.extractor_utils.feature_store refresh
+
+Each stored value carries the version of the provider that computed it.
+After a provider's version is bumped, refresh recomputes that provider's
+columns for every stored URL, fetching only the resources it reads. A row
+also keeps a hash of every resource its values were computed from: when an
+extraction finds one of them changed, the row's other values computed from
+it are recomputed too, so a row never mixes old and new resources.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from networksecurity.constant.feature_extractor import (
+    BATCH_MAX_CONCURRENCY,
+    EXTRACTOR_CACHE_DIR,
+    FEATURE_STORE_FILE_NAME,
+    URL_FEATURE_NAMES,
+)
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.extractor_utils.batch_extractor import _group_key
+from networksecurity.utils.extractor_utils.feature_registry import FEATURE_REGISTRY
+# registers the 30 features and their versions in FEATURE_REGISTRY
+from networksecurity.utils.feature_extractor import extract_features_from_url_async
+
+# int8 stored for a feature that was never extracted or came back as NaN
+MISSING_FEATURE_VALUE = -128
+
+# SQLite's default limit on the parameters of one statement is 999
+_READ_CHUNK_SIZE = 500
+
+
+class FeatureStore:
+    """
+    SQLite table with one row per URL: its feature_names values as int8
+    bytes, the version each value was computed with, the hashes of the
+    resources they were computed from and when the row was last written.
+    """
+
+    def __init__(self, file_path: str, feature_names: list = URL_FEATURE_NAMES):
+        self.file_path = file_path
+        self.feature_names = list(feature_names)
+        self._columns = {name: index for index, name in enumerate(self.feature_names)}
+        self._local = threading.local()
+
+        dir_path = os.path.dirname(self.file_path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS feature_vectors ("
+                "url TEXT PRIMARY KEY, feature_values BLOB NOT NULL, feature_versions TEXT NOT NULL, "
+                "resource_hashes TEXT NOT NULL, extracted_at REAL NOT NULL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.file_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM feature_vectors").fetchone()[0]
+
+    def urls(self) -> list:
+        return [url for (url,) in self._connection().execute("SELECT url FROM feature_vectors ORDER BY url")]
+
+    def _row(self, url: str):
+        return self._connection().execute(
+            "SELECT feature_values, feature_versions, resource_hashes, extracted_at FROM feature_vectors WHERE url = ?",
+            (url,),
+        ).fetchone()
+
+    def read(self, url: str):
+        """
+        {"features", "versions", "resource_hashes", "extracted_at"} of url,
+        None when it is not stored. Missing features are left out.
+        """
+        row = self._row(url)
+        if row is None:
+            return None
+        values = np.frombuffer(row[0], dtype=np.int8)
+        return {
+            "features": {name: int(value) for name, value in zip(self.feature_names, values)
+                         if value != MISSING_FEATURE_VALUE},
+            "versions": json.loads(row[1]),
+            "resource_hashes": json.loads(row[2]),
+            "extracted_at": row[3],
+        }
+
+    def write(self, url: str, features: dict, resource_hashes: dict = None) -> list:
+        """
+        Store features (name -> value) of url, stamped with the current
+        provider versions, over what is stored for it. NaN values are
+        stored as missing so they are extracted again.
+
+        resource_hashes are those of the resources the features were
+        computed from (see FeatureContext.resource_hashes). Stored features
+        read from a resource whose hash changed lose their version, so they
+        are stale; returns their names.
+        """
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT feature_values, feature_versions, resource_hashes FROM feature_vectors WHERE url = ?", (url,),
+            ).fetchone()
+            if row is None:
+                values = np.full(len(self.feature_names), MISSING_FEATURE_VALUE, dtype=np.int8)
+                versions, hashes = {}, {}
+            else:
+                values = np.frombuffer(row[0], dtype=np.int8).copy()
+                versions, hashes = json.loads(row[1]), json.loads(row[2])
+
+            resource_hashes = resource_hashes or {}
+            changed = {resource for resource, digest in resource_hashes.items()
+                       if hashes.get(resource, digest) != digest}
+            invalidated = [name for name in versions if name not in features
+                           and FEATURE_REGISTRY.providers[name].resources & changed]
+            for name in invalidated:
+                del versions[name]
+
+            current_versions = FEATURE_REGISTRY.versions(features)
+            for name, value in features.items():
+                if value is None or (isinstance(value, float) and math.isnan(value)):
+                    values[self._columns[name]] = MISSING_FEATURE_VALUE
+                    versions.pop(name, None)
+                else:
+                    values[self._columns[name]] = int(value)
+                    versions[name] = current_versions[name]
+            hashes.update(resource_hashes)
+
+            conn.execute(
+                "INSERT OR REPLACE INTO feature_vectors "
+                "(url, feature_values, feature_versions, resource_hashes, extracted_at) VALUES (?, ?, ?, ?, ?)",
+                (url, values.tobytes(), json.dumps(versions), json.dumps(hashes), time.time()),
+            )
+        return invalidated
+
+    def stale(self, urls=None) -> dict:
+        """
+        URL -> the feature names to (re)extract for it: the ones it does not
+        have, has from an older provider version, or has from a resource
+        since found changed (see write). urls defaults to every stored URL;
+        URLs not stored need every feature.
+        """
+        current_versions = FEATURE_REGISTRY.versions(self.feature_names)
+        stored = {}
+        if urls is None:
+            rows = self._connection().execute("SELECT url, feature_versions FROM feature_vectors")
+            stored = dict(rows)
+            urls = list(stored)
+        else:
+            urls = list(dict.fromkeys(urls))
+            for start in range(0, len(urls), _READ_CHUNK_SIZE):
+                chunk = urls[start:start + _READ_CHUNK_SIZE]
+                stored.update(self._connection().execute(
+                    f"SELECT url, feature_versions FROM feature_vectors WHERE url IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ))
+
+        stale = {}
+        for url in urls:
+            versions = json.loads(stored[url]) if url in stored else {}
+            names = [name for name in self.feature_names if versions.get(name) != current_versions[name]]
+            if names:
+                stale[url] = names
+        return stale
+
+    def read_matrix(self, urls=None):
+        """
+        (urls, int8 matrix of their features in feature_names order) for
+        urls, every stored URL when None. Features never extracted, and URLs
+        not stored, read as MISSING_FEATURE_VALUE.
+        """
+        conn = self._connection()
+        if urls is None:
+            rows = conn.execute("SELECT url, feature_values FROM feature_vectors ORDER BY url").fetchall()
+            urls = [url for url, _ in rows]
+            blobs = [blob for _, blob in rows]
+        else:
+            urls = list(urls)
+            found = {}
+            unique_urls = list(dict.fromkeys(urls))
+            for start in range(0, len(unique_urls), _READ_CHUNK_SIZE):
+                chunk = unique_urls[start:start + _READ_CHUNK_SIZE]
+                found.update(conn.execute(
+                    f"SELECT url, feature_values FROM feature_vectors WHERE url IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ))
+            missing = bytes([MISSING_FEATURE_VALUE & 0xFF]) * len(self.feature_names)
+            blobs = [found.get(url, missing) for url in urls]
+
+        matrix = np.frombuffer(b"".join(blobs), dtype=np.int8).reshape(len(blobs), len(self.feature_names))
+        return urls, matrix
+
+    async def materialize_async(self, urls=None, max_concurrency: int = BATCH_MAX_CONCURRENCY) -> int:
+        """
+        Extract the stale features (see stale) of urls, every stored URL
+        when None, and store them. Returns the number of URLs updated.
+        """
+        stale = self.stale(urls)
+        limit = asyncio.Semaphore(max_concurrency)
+        # URLs of one registered domain share their WHOIS and DNS lookups
+        domain_lookups = defaultdict(dict)
+
+        async def run_one(url, names):
+            # features found computed from a changed resource are extracted
+            # again once, right away; a page that changes on every fetch
+            # leaves the rest to the next refresh
+            for _ in range(2):
+                if not names:
+                    break
+                async with limit:
+                    resource_hashes = {}
+                    try:
+                        values = await extract_features_from_url_async(
+                            url, domain_lookups=domain_lookups[_group_key(url)], feature_names=names,
+                            resource_hashes=resource_hashes,
+                        )
+                    except Exception as e:
+                        logging.info(f"Feature extraction failed for {url}: {e}")
+                        return False
+                names = self.write(url, dict(zip(names, values)), resource_hashes)
+            return True
+
+        updated = await asyncio.gather(*(run_one(url, names) for url, names in stale.items()))
+        return sum(updated)
+
+    def materialize(self, urls=None, **kwargs) -> int:
+        try:
+            return asyncio.run(self.materialize_async(urls, **kwargs))
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+
+def default_feature_store_path() -> str:
+    return os.path.join(EXTRACTOR_CACHE_DIR, FEATURE_STORE_FILE_NAME)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep the extracted features of URLs in a feature store")
+    parser.add_argument("--store", default=default_feature_store_path(), help="feature store file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    materialize_parser = commands.add_parser("materialize", help="extract and store the features of new URLs")
+    materialize_parser.add_argument("input", help="text file with one URL per line")
+    commands.add_parser("refresh", help="extract again the stored features computed by an older provider version")
+    for command_parser in commands.choices.values():
+        command_parser.add_argument("--max-concurrency", type=int, default=BATCH_MAX_CONCURRENCY)
+    args = parser.parse_args()
+
+    store = FeatureStore(args.store)
+    urls = None
+    if args.command == "materialize":
+        with open(args.input) as file:
+            urls = [line.strip() for line in file if line.strip()]
+    stale = store.stale(urls)
+    columns = sum(len(names) for names in stale.values())
+    print(f"{len(stale)} URLs with {columns} stale features to extract")
+    updated = store.materialize(urls, max_concurrency=args.max_concurrency)
+    print(f"Updated {updated} URLs, {len(store)} URLs in {args.store}")
+
+
+if __name__ == "__main__":
+    main()
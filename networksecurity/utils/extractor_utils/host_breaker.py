@@ -0,0 +1,71 @@
+import threading
+
+from networksecurity.constant.feature_extractor import (
+    HOST_BREAKER_FAILURE_THRESHOLD,
+    HOST_BREAKER_FAILURE_WINDOW,
+    HOST_BREAKER_COOLDOWN,
+    HOST_BREAKER_CACHE_SIZE,
+)
+from networksecurity.logging.logger import logging
+from networksecurity.utils.extractor_utils.ttl_cache import TTLCache, MISSING
+
+
+class HostCircuitBreaker:
+    """
+    Per-host circuit breaker for page fetches.
+
+    Timeouts and connection failures are counted per host; a failure more
+    than failure_window seconds after the previous one starts the count
+    again. When a host reaches failure_threshold the circuit opens: the host
+    is negatively cached for cooldown seconds and is_open() tells callers to
+    skip the network. After the cool-down the next fetch is a trial, a
+    failure reopens the circuit at once and a success closes it.
+    """
+
+    def __init__(self, failure_threshold: int = HOST_BREAKER_FAILURE_THRESHOLD,
+                 failure_window: float = HOST_BREAKER_FAILURE_WINDOW,
+                 cooldown: float = HOST_BREAKER_COOLDOWN, cache_size: int = HOST_BREAKER_CACHE_SIZE):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        # host -> consecutive failures
+        self.failures = TTLCache(maxsize=cache_size, ttl=failure_window)
+        # hosts whose circuit is open
+        self.open_hosts = TTLCache(maxsize=cache_size, ttl=cooldown)
+        self._lock = threading.Lock()
+
+    def is_open(self, host: str) -> bool:
+        return self.open_hosts.get(host) is not MISSING
+
+    def record_success(self, host: str) -> None:
+        self.failures.pop(host)
+
+    def record_failure(self, host: str) -> None:
+        with self._lock:
+            count = self.failures.get(host, 0) + 1
+            if count < self.failure_threshold:
+                self.failures.set(host, count)
+                return
+
+            # keep the count one short of the threshold so a failed trial
+            # after the cool-down opens the circuit again
+            self.failures.set(host, self.failure_threshold - 1, ttl=self.cooldown + self.failures.ttl)
+        self.open_hosts.set(host, True)
+        logging.info(f"Circuit opened for {host} after {count} failed fetches, skipping it for {self.cooldown}s")
+
+    def stats(self) -> dict:
+        """open hosts (size) and fetches skipped (hits) or let through (misses)"""
+        return self.open_hosts.stats()
+
+
+_host_breaker = None
+_host_breaker_lock = threading.Lock()
+
+
+def get_host_breaker() -> HostCircuitBreaker:
+    """Process wide HostCircuitBreaker"""
+    global _host_breaker
+    if _host_breaker is None:
+        with _host_breaker_lock:
+            if _host_breaker is None:
+                _host_breaker = HostCircuitBreaker()
+    return _host_breaker
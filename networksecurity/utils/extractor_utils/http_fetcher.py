@@ -0,0 +1,331 @@
+import codecs
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.compat import chardet
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+
+from networksecurity.constant.feature_extractor import (
+    EXTRACTOR_USER_AGENT,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_POOL_BLOCK,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    PAGE_DOWNLOAD_MAX_BYTES,
+    PAGE_DOWNLOAD_DEADLINE,
+    PAGE_DOWNLOAD_CHUNK_SIZE,
+    HOST_BREAKER_ENABLED,
+)
+from networksecurity.utils.extractor_utils.dns_resolver import get_dns_resolver
+from networksecurity.utils.extractor_utils.dom_features import DomDigestCollector, DomDigestParser
+from networksecurity.utils.extractor_utils.host_breaker import get_host_breaker
+
+# FetchResult.error of a fetch skipped because the host's circuit is open
+CIRCUIT_OPEN_ERROR = "CircuitOpen"
+
+# errors that count against a host: it is down, unreachable or too slow
+_HOST_FAILURES = (requests.ConnectionError, requests.Timeout, Urllib3HTTPError)
+
+
+class _ResolvedConnectionMixin:
+    """Connect to an address the extractor's DNS layer already resolved instead of resolving again"""
+
+    def _new_conn(self):
+        addresses = get_dns_resolver().cached_addresses(self.host)
+        if not addresses:
+            return super()._new_conn()
+
+        # host is backed by _dns_host; swap it only while the socket is opened
+        # so TLS SNI, certificate checks and the Host header keep the name
+        hostname = self._dns_host
+        self._dns_host = addresses[0]
+        try:
+            return super()._new_conn()
+        finally:
+            self._dns_host = hostname
+
+
+class _ResolvedHTTPConnection(_ResolvedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _ResolvedHTTPSConnection(_ResolvedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _ResolvedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _ResolvedHTTPConnection
+
+
+class _ResolvedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _ResolvedHTTPSConnection
+
+
+class ResolvedHostAdapter(HTTPAdapter):
+    """requests adapter whose connections reuse addresses cached by DnsResolver"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _ResolvedHTTPConnectionPool,
+            "https": _ResolvedHTTPSConnectionPool,
+        }
+
+
+_http_adapter = None
+_http_adapter_lock = threading.Lock()
+
+
+def get_http_adapter() -> ResolvedHostAdapter:
+    """
+    Process wide adapter holding the extractor's keep-alive connection pools:
+    up to HTTP_POOL_MAXSIZE connections for each of the HTTP_POOL_CONNECTIONS
+    most recently used hosts.
+    """
+    global _http_adapter
+    if _http_adapter is None:
+        with _http_adapter_lock:
+            if _http_adapter is None:
+                _http_adapter = ResolvedHostAdapter(
+                    pool_connections=HTTP_POOL_CONNECTIONS,
+                    pool_maxsize=HTTP_POOL_MAXSIZE,
+                    pool_block=HTTP_POOL_BLOCK,
+                )
+    return _http_adapter
+
+
+def new_session() -> requests.Session:
+    """
+    Session for one fetch. Cookies stay private to it while connections come
+    from get_http_adapter(), so they are reused across fetches and features.
+    Do not close it: that would close the shared pools.
+    """
+    session = requests.Session()
+    adapter = get_http_adapter()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = EXTRACTOR_USER_AGENT
+    return session
+
+
+@dataclass
+class FetchResult:
+    """
+    Everything the extractor learns from downloading a URL once: the redirect
+    chain, the final status and headers, and the body. Page, redirect and
+    header based features all read from this object.
+    """
+    url: str
+    final_url: Optional[str] = None
+    status_code: Optional[int] = None
+    headers: dict = field(default_factory=dict)
+    # (status_code, url) for every hop before the final response
+    redirect_chain: list = field(default_factory=list)
+    text: Optional[str] = None
+    error: Optional[str] = None
+    # the body was cut at PAGE_DOWNLOAD_MAX_BYTES or PAGE_DOWNLOAD_DEADLINE
+    truncated: bool = False
+    # DomDigestCollector parsed while the body streamed in, see fetch_url
+    dom_digest: Optional[DomDigestCollector] = None
+    # body bytes received and time spent parsing them
+    body_bytes: int = 0
+    parse_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def page_content(self) -> Optional[str]:
+        """Body of the final response, only when it was served with 200"""
+        return self.text if self.status_code == 200 else None
+
+    @property
+    def redirect_count(self) -> int:
+        return len(self.redirect_chain)
+
+
+def _incremental_decoder(encoding: Optional[str], first_chunk: bytes):
+    """Decoder for the body, picking the encoding like requests' Response.text"""
+    if encoding is None and chardet is not None:
+        # no charset in the headers, guess from the first chunk
+        encoding = chardet.detect(first_chunk)["encoding"]
+    try:
+        return codecs.getincrementaldecoder(encoding)(errors="replace")
+    except (LookupError, TypeError):
+        return codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+
+def _read_body(response: requests.Response, result: FetchResult, deadline: float, parser) -> None:
+    """Stream the body into result.text, feeding parser, within the size and time limits"""
+    raw = response.raw
+    # read1 returns whatever one socket read produced, and every read may
+    # only wait for the time left: a slow sender is cut at the deadline
+    read = getattr(raw, "read1", raw.read)
+
+    decoder = None
+    parts = []
+    size = 0
+    while True:
+        remaining = deadline - time.monotonic()
+        if size >= PAGE_DOWNLOAD_MAX_BYTES or remaining <= 0:
+            result.truncated = True
+            break
+
+        # looked up before every read: once the body is complete the
+        # connection goes back to the pool, and its socket to other requests
+        sock = getattr(getattr(raw, "connection", None), "sock", None)
+        if sock is not None and sock.fileno() != -1:
+            sock.settimeout(min(HTTP_READ_TIMEOUT, remaining))
+        try:
+            chunk = read(min(PAGE_DOWNLOAD_CHUNK_SIZE, PAGE_DOWNLOAD_MAX_BYTES - size), decode_content=True)
+        except _HOST_FAILURES:
+            if time.monotonic() < deadline:
+                raise
+            # the read waited out the time left: keep what arrived
+            result.truncated = True
+            break
+        if not chunk:
+            break
+        size += len(chunk)
+
+        if decoder is None:
+            decoder = _incremental_decoder(response.encoding, chunk)
+        text = decoder.decode(chunk)
+        parts.append(text)
+        if parser is not None:
+            start = time.perf_counter()
+            parser.feed(text)
+            result.parse_seconds += time.perf_counter() - start
+
+    if decoder is not None and not result.truncated:
+        tail = decoder.decode(b"", final=True)
+        parts.append(tail)
+        if parser is not None:
+            parser.feed(tail)
+
+    result.text = "".join(parts)
+    # bytes off the wire, before gzip/deflate decoding
+    result.body_bytes = raw.tell()
+    if parser is not None:
+        start = time.perf_counter()
+        result.dom_digest = parser.close()
+        result.parse_seconds += time.perf_counter() - start
+
+
+def _breaker_host(url: str) -> Optional[str]:
+    return urlparse(url).hostname if HOST_BREAKER_ENABLED else None
+
+
+def _hop_timeout(deadline: float) -> tuple:
+    """(connect, read) timeouts of a request, neither running past deadline"""
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise requests.Timeout(f"{PAGE_DOWNLOAD_DEADLINE} s page download deadline exceeded")
+    return min(HTTP_CONNECT_TIMEOUT, remaining), min(HTTP_READ_TIMEOUT, remaining)
+
+
+def fetch_url(url: str, parse_dom: bool = False, read_body: bool = True) -> FetchResult:
+    """
+    GET url following redirects and record the whole exchange. Network errors
+    are returned in FetchResult.error instead of being raised.
+
+    The fetch is held to PAGE_DOWNLOAD_DEADLINE seconds from the call:
+    redirects are followed one hop at a time, no hop starts after the
+    deadline, a hop's connect and read timeouts are cut to the time left
+    when it starts, and every body read to the time left when it is made,
+    so the body stops at the deadline. The status line and headers are read
+    by http.client with the hop's timeout per socket read: a server
+    sending them a few bytes at a time can still hold a hop past the
+    deadline.
+
+    The body is only downloaded for a 200 response, and streamed: at most
+    PAGE_DOWNLOAD_MAX_BYTES are kept and reading stops at the deadline,
+    marking the result truncated. With parse_dom, every chunk also goes
+    through a DomDigestParser, so FetchResult.dom_digest is ready as soon
+    as the body is. With read_body False only the redirect
+    chain and the final status and headers are kept.
+
+    Timeouts and connection failures are reported to the host circuit
+    breaker against the host of the hop that failed; while the circuit of
+    a hop's host is open the fetch is skipped and returns
+    CIRCUIT_OPEN_ERROR straight away.
+    """
+    breaker = get_host_breaker()
+    deadline = time.monotonic() + PAGE_DOWNLOAD_DEADLINE
+    session = new_session()
+    request = None
+    history = []
+    while True:
+        hop_url = request.url if request is not None else url
+        host = _breaker_host(hop_url)
+        if host and breaker.is_open(host):
+            return FetchResult(url=url, error=CIRCUIT_OPEN_ERROR)
+        try:
+            timeout = _hop_timeout(deadline)
+        except requests.Timeout as e:
+            # the chain as a whole ran out of time, no one host is to blame
+            return FetchResult(url=url, error=type(e).__name__)
+        try:
+            if request is None:
+                response = session.get(url, timeout=timeout, verify=False, stream=True, allow_redirects=False)
+            else:
+                proxies = session.merge_environment_settings(request.url, {}, True, False, None)["proxies"]
+                response = session.send(request, timeout=timeout, verify=False, stream=True,
+                                        allow_redirects=False, proxies=proxies)
+        except Exception as e:
+            if host and isinstance(e, _HOST_FAILURES):
+                breaker.record_failure(host)
+            return FetchResult(url=url, error=type(e).__name__)
+
+        # the next request of a redirect, prepared like requests does when following it
+        request = response.next
+        if request is None:
+            break
+        history.append(response)
+        if len(history) > session.max_redirects:
+            response.close()
+            return FetchResult(url=url, error=requests.TooManyRedirects.__name__)
+        response.close()
+        if host:
+            breaker.record_success(host)
+
+    result = FetchResult(
+        url=url,
+        final_url=response.url,
+        status_code=response.status_code,
+        headers=response.headers,
+        redirect_chain=[(hop.status_code, hop.url) for hop in history],
+    )
+    if response.status_code != 200 or not read_body:
+        response.close()
+        if host:
+            breaker.record_success(host)
+        return result
+
+    try:
+        _read_body(response, result, deadline, DomDigestParser() if parse_dom else None)
+    except Exception as e:
+        response.close()
+        if host and isinstance(e, _HOST_FAILURES):
+            breaker.record_failure(host)
+        return FetchResult(url=url, error=type(e).__name__)
+
+    if result.truncated:
+        # the rest of the body is still on the wire, the connection cannot be reused
+        response.close()
+    if host:
+        # a body still streaming at the deadline means the host is too slow
+        if result.truncated and time.monotonic() >= deadline:
+            breaker.record_failure(host)
+        else:
+            breaker.record_success(host)
+    return result
@@ -0,0 +1,120 @@
+import bisect
+import threading
+
+from networksecurity.constant.feature_extractor import (
+    INSTRUMENTATION_SECONDS_BUCKETS,
+    INSTRUMENTATION_BYTES_BUCKETS,
+)
+
+# outcomes a stage or feature can end with
+OUTCOME_OK = "ok"
+OUTCOME_TIMEOUT = "timeout"
+OUTCOME_ERROR = "error"
+# a placeholder value was used because the data behind the feature was missing
+OUTCOME_FALLBACK = "fallback"
+# the value came from the FeatureCache
+OUTCOME_CACHED = "cached"
+
+
+def error_outcome(error_name: str) -> str:
+    """timeout or error for the exception class name of a failed lookup"""
+    return OUTCOME_TIMEOUT if "Timeout" in error_name else OUTCOME_ERROR
+
+
+class Histogram:
+    """Cumulative histogram with labels, rendered in the Prometheus text format"""
+
+    def __init__(self, name: str, documentation: str, buckets: list, label_names: tuple):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = sorted(buckets)
+        self.label_names = label_names
+        # label values -> (bucket counts, sum, count)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total, count = self._series.get(label_values) or ([0] * len(self.buckets), 0.0, 0)
+            if index < len(counts):
+                counts[index] += 1
+            self._series[label_values] = (counts, total + value, count + 1)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted(self._series.items())
+        for label_values, (counts, total, count) in series:
+            labels = ",".join(f'{name}="{value}"' for name, value in zip(self.label_names, label_values))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"{self.name}_sum{{{labels}}} {total}")
+            lines.append(f"{self.name}_count{{{labels}}} {count}")
+        return lines
+
+
+STAGE_SECONDS = Histogram(
+    "extractor_stage_seconds", "Wall time of each extraction stage (WHOIS, DNS, page fetch, parsing)",
+    INSTRUMENTATION_SECONDS_BUCKETS, ("stage", "outcome"),
+)
+STAGE_BYTES = Histogram(
+    "extractor_stage_bytes", "Size of the response behind each extraction stage (WHOIS, DNS, page body)",
+    INSTRUMENTATION_BYTES_BUCKETS, ("stage",),
+)
+FEATURE_SECONDS = Histogram(
+    "extractor_feature_seconds", "Wall time to produce each of the 30 features",
+    INSTRUMENTATION_SECONDS_BUCKETS, ("feature", "outcome"),
+)
+
+
+def render_metrics() -> str:
+    """All extractor histograms in the Prometheus text exposition format"""
+    lines = []
+    for histogram in (STAGE_SECONDS, STAGE_BYTES, FEATURE_SECONDS):
+        lines.extend(histogram.render())
+    return "\n".join(lines) + "\n"
+
+
+class ExtractionTrace:
+    """
+    Timing, outcome and bytes of every stage and feature of one extraction.
+    Pass one to extract_features_from_url_async and read to_dict() afterwards;
+    everything recorded is also added to the module histograms.
+
+    Features computed together in one pass (the DOM features, the page text
+    features) each report the time of that shared pass.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.features = {}
+
+    def record_stage(self, stage: str, seconds: float, outcome: str = OUTCOME_OK, size: int = None) -> None:
+        self.stages[stage] = {"seconds": seconds, "outcome": outcome, "bytes": size}
+        STAGE_SECONDS.observe(seconds, stage, outcome)
+        if size is not None:
+            STAGE_BYTES.observe(size, stage)
+
+    def record_feature(self, feature: str, seconds: float, outcome: str = OUTCOME_OK) -> None:
+        self.features[feature] = {"seconds": seconds, "outcome": outcome}
+        FEATURE_SECONDS.observe(seconds, feature, outcome)
+
+    def to_dict(self) -> dict:
+        return {"stages": dict(self.stages), "features": dict(self.features)}
+
+
+class _NoTrace:
+    """Stands in for ExtractionTrace when instrumentation is off"""
+
+    def record_stage(self, *args, **kwargs) -> None:
+        pass
+
+    def record_feature(self, *args, **kwargs) -> None:
+        pass
+
+
+NO_TRACE = _NoTrace()
@@ -0,0 +1,121 @@
+import re
+from urllib.parse import urlparse
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.constant.feature_extractor import LEXICAL_FEATURE_NAMES
+from networksecurity.utils.feature_extractor import (
+    extract_lexical_features,
+    having_Sub_Domain,
+    port,
+)
+
+# same patterns as the scalar functions in feature_extractor.py; the
+# lookahead only lets the regex engine skip ahead to digits
+IP_ADDRESS_PATTERN = re.compile(
+    r'(?=[0-9])((25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)'
+)
+SHORTENING_SERVICE_PATTERN = re.compile('|'.join(re.escape(service) for service in [
+    'bit.ly', 'goo.gl', 'shorte.st', 'x.co', 'ow.ly', 'tinyurl.com',
+    't.co', 'bit.do', 'adf.ly', 'bitly.com', 'short.to', 'rb.gy',
+    'cutt.ly', 'is.gd', 'buff.ly', 'tiny.cc', 'lnkd.in'
+]))
+AT_SYMBOL_PATTERN = re.compile('@')
+# patterns run over all URLs joined by newlines, one URL per line
+URL_PARTS_PATTERN = re.compile(r'^(https?)://([^/?#\n]*)', re.MULTILINE)
+DOUBLE_SLASH_PATTERN = re.compile(r'^https?://[^/\n]*(?=/)[^\n]*//', re.MULTILINE)
+
+# urlparse strips tab/CR/LF, validates brackets and NFKC-checks non-ASCII
+# netlocs; rows with any of these or non-ASCII text go through the scalar functions
+IRREGULAR_URL_PATTERN = re.compile(r'[\[\]\t\r\n]')
+
+
+def _matching_rows(pattern: re.Pattern, text: str, row_starts: np.ndarray) -> np.ndarray:
+    """Boolean mask of the rows of text (see row_starts) where pattern matches"""
+    positions = np.fromiter((match.start() for match in pattern.finditer(text)), dtype=np.int64)
+    mask = np.zeros(len(row_starts), dtype=bool)
+    mask[np.searchsorted(row_starts, positions, side='right') - 1] = True
+    return mask
+
+
+def _host_features(netloc: str) -> tuple:
+    """Prefix_Suffix, having_Sub_Domain, port and HTTPS_token, which only depend on the host"""
+    domain = netloc.lower()
+    return (
+        -1 if '-' in domain.split(':')[0] else 1,
+        having_Sub_Domain('http://' + netloc),
+        port(urlparse('http://' + netloc)),
+        -1 if 'https' in domain else 1,
+    )
+
+
+def _regular_lexical_features(urls: list) -> np.ndarray:
+    urls = [url if url.startswith(('http://', 'https://')) else 'http://' + url for url in urls]
+    lengths = np.fromiter(map(len, urls), dtype=np.int64, count=len(urls))
+    row_starts = np.zeros(len(urls), dtype=np.int64)
+    np.cumsum(lengths[:-1] + 1, out=row_starts[1:])
+
+    # none of these URLs contain a newline, so no match can span two rows
+    text = '\n'.join(urls)
+    schemes, netlocs = zip(*URL_PARTS_PATTERN.findall(text))
+    is_https = np.array(schemes) == 'https'
+
+    codes, hosts = pd.factorize(pd.Series(netlocs, dtype=object))
+    host_features = np.array([_host_features(host) for host in hosts], dtype=np.int8).reshape(-1, 4)[codes]
+
+    def flag(is_phishing: np.ndarray) -> np.ndarray:
+        return np.where(is_phishing, -1, 1)
+
+    features = np.empty((len(urls), len(LEXICAL_FEATURE_NAMES)), dtype=np.int8)
+    features[:, 0] = flag(_matching_rows(IP_ADDRESS_PATTERN, text, row_starts))
+    features[:, 1] = np.select([lengths < 54, lengths < 75], [1, 0], default=-1)
+    # ASCII only, so lowercasing keeps every row at the same offset
+    features[:, 2] = flag(_matching_rows(SHORTENING_SERVICE_PATTERN, text.lower(), row_starts))
+    features[:, 3] = flag(_matching_rows(AT_SYMBOL_PATTERN, text, row_starts))
+    features[:, 4] = flag(_matching_rows(DOUBLE_SLASH_PATTERN, text, row_starts))
+    features[:, 5] = host_features[:, 0]
+    features[:, 6] = host_features[:, 1]
+    features[:, 7] = np.where(is_https, 1, -1)
+    features[:, 8] = host_features[:, 2]
+    features[:, 9] = np.where(is_https, 1, host_features[:, 3])
+    return features
+
+
+def compute_lexical_features(urls) -> np.ndarray:
+    """
+    Lexical features for many URLs at once, as an int8 matrix with one row
+    per URL and columns in the order of LEXICAL_FEATURE_NAMES.
+
+    urls: pandas Series, NumPy array or any iterable of URL strings.
+
+    The values are identical to extract_lexical_features row by row. The URLs
+    are joined into one string so each precompiled regex scans all of them
+    in a single call, host features are computed once per distinct host, and
+    the few URLs urlparse treats specially are handed to the scalar functions.
+    """
+    urls = list(urls)
+    features = np.empty((len(urls), len(LEXICAL_FEATURE_NAMES)), dtype=np.int8)
+
+    # non-string values take the scalar path as well
+    irregular = np.fromiter(
+        (not isinstance(url, str) or not url.isascii() or IRREGULAR_URL_PATTERN.search(url) is not None
+         for url in urls),
+        dtype=bool, count=len(urls),
+    )
+    regular = np.flatnonzero(~irregular)
+    if len(regular):
+        features[regular] = _regular_lexical_features([urls[index] for index in regular])
+    for index in np.flatnonzero(irregular):
+        features[index] = extract_lexical_features(urls[index])
+    return features
+
+
+def compute_lexical_features_frame(urls) -> pd.DataFrame:
+    """compute_lexical_features as a DataFrame indexed by URL"""
+    urls = list(urls)
+    return pd.DataFrame(
+        compute_lexical_features(urls),
+        columns=LEXICAL_FEATURE_NAMES,
+        index=pd.Index(urls, name="url"),
+    )
@@ -0,0 +1,100 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from networksecurity.constant.feature_extractor import (
+    PAGE_DIGEST_CACHE_MAX_BYTES,
+    PAGE_DIGEST_CACHE_MAX_ENTRIES,
+)
+from networksecurity.utils.extractor_utils.ttl_cache import MISSING
+
+
+def page_hash(page_content: str) -> bytes:
+    """
+    Hash of the page body after normalizing what no page feature depends on:
+    CRLF line ends and surrounding whitespace.
+    """
+    normalized = page_content.replace('\r\n', '\n').strip()
+    return hashlib.blake2b(normalized.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+class PageDigestCache:
+    """
+    Thread-safe LRU memo of what the page features are computed from, keyed
+    by page_hash, so byte-identical pages served from many domains are
+    parsed and scanned once. Entries carry an estimated size and the least
+    recently used ones are evicted to stay within max_entries and max_bytes.
+    Page contents do not go stale, so there is no TTL.
+    """
+
+    def __init__(self, max_bytes: int = PAGE_DIGEST_CACHE_MAX_BYTES, max_entries: int = PAGE_DIGEST_CACHE_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=MISSING):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, size: int) -> None:
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.nbytes -= previous[0]
+            self._entries[key] = (size, value)
+            self.nbytes += size
+            while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+                evicted_size, _ = self._entries.popitem(last=False)[1]
+                self.nbytes -= evicted_size
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute, size_of):
+        """Cached value of key, or compute() stored with size_of(value) bytes"""
+        value = self.get(key)
+        if value is MISSING:
+            value = compute()
+            self.set(key, value, size_of(value))
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "bytes": self.nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+_page_digest_cache = None
+_page_digest_cache_lock = threading.Lock()
+
+
+def get_page_digest_cache() -> PageDigestCache:
+    """Process wide PageDigestCache used by the page feature providers"""
+    global _page_digest_cache
+    if _page_digest_cache is None:
+        with _page_digest_cache_lock:
+            if _page_digest_cache is None:
+                _page_digest_cache = PageDigestCache()
+    return _page_digest_cache
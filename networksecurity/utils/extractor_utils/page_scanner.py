@@ -0,0 +1,96 @@
+import re
+from collections import Counter
+
+PAGE_TEXT_FEATURE_NAMES = ["Submitting_to_email", "on_mouseover", "RightClick", "popUpWidnow"]
+
+# values used when the page could not be downloaded or scanned
+PAGE_TEXT_FEATURE_FALLBACKS = {
+    "Submitting_to_email": -1,
+    "on_mouseover": 1,
+    "RightClick": 1,
+    "popUpWidnow": 1,
+}
+
+# substrings popUpWidnow counts; the backslashes are part of the text searched for
+POPUP_PATTERNS = ['window.open', 'popup', 'alert\\(', 'confirm\\(']
+
+# The "A.*B" patterns of on_mouseover and RightClick as (feature, A, B):
+# the feature fires when B starts after A ends on the same line. [^\n]
+# stands in for the "." of the original patterns. "oncontextmenu.*return false"
+# is left out since "oncontextmenu.*false" already covers it.
+PAGE_TEXT_RULES = [
+    ('on_mouseover', re.compile(r'onmouseover'), re.compile(r'window[^\n]status')),
+    ('on_mouseover', re.compile(r'onmouseover'), re.compile(r'location[^\n]href')),
+    ('on_mouseover', re.compile(r'window[^\n]status'), re.compile(r'onmouseover')),
+    ('RightClick', re.compile(r'oncontextmenu'), re.compile(r'false')),
+    ('RightClick', re.compile(r'event[^\n]button'), re.compile(r'2')),
+    ('RightClick', re.compile(r'contextmenu'), re.compile(r'preventdefault')),
+]
+
+
+def _lines_matching(text: str, first, then) -> int:
+    """Number of lines of text where then starts after the end of first"""
+    lines = 0
+    match = first.search(text)
+    while match:
+        line_end = text.find('\n', match.end())
+        if line_end == -1:
+            line_end = len(text)
+
+        # the first occurrence on a line leaves the longest rest of line to
+        # search, so every other occurrence on it can be skipped
+        if then.search(text, match.end(), line_end):
+            lines += 1
+        match = first.search(text, line_end + 1)
+    return lines
+
+
+def scan_page_text(page_content: str) -> Counter:
+    """
+    Lowercase the page once and count what the page text features look for:
+    the lines matching each PAGE_TEXT_RULES feature, and the occurrences of
+    mailto: and of each POPUP_PATTERNS entry.
+
+    Every pattern is a fixed-length token compiled once, and "A.*B" is
+    resolved by searching for B only in the rest of the line after the first
+    A, so no search backtracks over the page.
+    """
+    text = page_content.lower()
+    counts = Counter()
+
+    for feature, first, then in PAGE_TEXT_RULES:
+        counts[feature] += _lines_matching(text, first, then)
+
+    for pattern in POPUP_PATTERNS + ['mailto:']:
+        counts[pattern] = text.count(pattern)
+
+    return counts
+
+
+def extract_page_text_features(page_content: str) -> dict:
+    """
+    Submitting_to_email, on_mouseover, RightClick and popUpWidnow from a
+    single scan_page_text call
+    """
+    if not page_content:
+        return dict(PAGE_TEXT_FEATURE_FALLBACKS)
+
+    try:
+        counts = scan_page_text(page_content)
+    except Exception:
+        return dict(PAGE_TEXT_FEATURE_FALLBACKS)
+
+    popup_count = sum(1 for pattern in POPUP_PATTERNS if counts[pattern])
+    if popup_count == 0:
+        popup = 1   # No popups
+    elif popup_count <= 2:
+        popup = 0   # Few popups - suspicious
+    else:
+        popup = -1  # Many popups - phishing
+
+    return {
+        "Submitting_to_email": -1 if counts['mailto:'] else 1,
+        "on_mouseover": -1 if counts['on_mouseover'] else 1,
+        "RightClick": -1 if counts['RightClick'] else 1,
+        "popUpWidnow": popup,
+    }
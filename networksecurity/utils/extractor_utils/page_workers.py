@@ -0,0 +1,148 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from networksecurity.constant.feature_extractor import PAGE_WORKER_PROCESSES, PAGE_WORKER_QUEUE_SIZE
+from networksecurity.utils.extractor_utils.dom_features import extract_dom_digest
+from networksecurity.utils.extractor_utils.page_scanner import extract_page_text_features
+
+# CPU bound analyses of a page body, neither depends on the page's domain:
+# "dom" is the DomDigestCollector of the page, "text" the page text features
+PAGE_ANALYSES = {
+    "dom": extract_dom_digest,
+    "text": extract_page_text_features,
+}
+
+
+def analysis_nbytes(kind: str, value) -> int:
+    """Rough memory taken by the result of a page analysis, for the PageDigestCache"""
+    if kind == "dom":
+        return value.nbytes if value is not None else 64
+    return 256
+
+
+def analyze_page(page_content: str, kinds) -> dict:
+    """Run the PAGE_ANALYSES named in kinds on page_content; what the worker processes run"""
+    return {kind: PAGE_ANALYSES[kind](page_content) for kind in kinds}
+
+
+class PageWorkersOverloaded(Exception):
+    """Every worker is busy and the queue in front of them is full"""
+
+
+class PageWorkerPool:
+    """
+    Worker processes for the HTML parsing and regex scanning of pages, so a
+    burst of large pages does not hold the GIL of the process serving
+    requests. At most max_workers pages are analyzed and max_queue more wait
+    at any time; submitting beyond that raises PageWorkersOverloaded at once
+    instead of queueing without bound.
+
+    The pool is used by the extractor only once enable() was called, which
+    the API does at startup; batch runs and the CLIs analyze pages in their
+    own process. The processes are started with the first page and started
+    again if one of them dies. They are spawned, so they import the
+    __main__ module of the parent again (as __mp_main__): a script using the
+    pool keeps its side effects under a __main__ guard or a startup hook.
+    """
+
+    def __init__(self, max_workers: int = PAGE_WORKER_PROCESSES, max_queue: int = PAGE_WORKER_QUEUE_SIZE):
+        self.max_workers = max_workers
+        self.capacity = max_workers + max_queue
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self.enabled = False
+        self._executor = None
+        self._lock = threading.Lock()
+        self._counts_lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawned, a forked child would inherit the locks held by the parent's threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _restart(self, executor) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def enable(self) -> None:
+        """Have the extractor analyze pages in this pool from now on"""
+        self.enabled = True
+
+    @property
+    def saturated(self) -> bool:
+        """True when a page submitted now would be rejected"""
+        return self.in_flight >= self.capacity
+
+    def submit(self, page_content: str, kinds):
+        """concurrent.futures.Future of analyze_page(page_content, kinds)"""
+        if not self._slots.acquire(blocking=False):
+            with self._counts_lock:
+                self.rejected += 1
+            raise PageWorkersOverloaded(f"{self.capacity} pages are already being analyzed or queued")
+        with self._counts_lock:
+            self.in_flight += 1
+        executor = self._get_executor()
+
+        def release(future):
+            with self._counts_lock:
+                self.in_flight -= 1
+                self.completed += 1
+            self._slots.release()
+            if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+                self._restart(executor)
+
+        try:
+            future = executor.submit(analyze_page, page_content, tuple(kinds))
+        except BrokenProcessPool:
+            with self._counts_lock:
+                self.in_flight -= 1
+            self._slots.release()
+            self._restart(executor)
+            raise
+        future.add_done_callback(release)
+        return future
+
+    async def analyze(self, page_content: str, kinds) -> dict:
+        """Awaitable analyze_page(page_content, kinds), raises PageWorkersOverloaded when full"""
+        return await asyncio.wrap_future(self.submit(page_content, kinds))
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        self.enabled = False
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+_page_worker_pool = None
+_page_worker_pool_lock = threading.Lock()
+
+
+def get_page_worker_pool() -> PageWorkerPool:
+    """Process wide PageWorkerPool sized by PAGE_WORKER_PROCESSES and PAGE_WORKER_QUEUE_SIZE"""
+    global _page_worker_pool
+    if _page_worker_pool is None:
+        with _page_worker_pool_lock:
+            if _page_worker_pool is None:
+                _page_worker_pool = PageWorkerPool()
+    return _page_worker_pool
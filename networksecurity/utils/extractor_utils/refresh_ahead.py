@@ -0,0 +1,250 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from networksecurity.constant.feature_extractor import (
+    URL_FEATURE_NAMES,
+    REFRESH_AHEAD_INTERVAL,
+    REFRESH_AHEAD_LEAD,
+    REFRESH_AHEAD_MIN_REQUESTS,
+    REFRESH_AHEAD_HALF_LIFE,
+    REFRESH_AHEAD_MAX_CONCURRENCY,
+    REFRESH_AHEAD_MAX_PER_CYCLE,
+    REFRESH_AHEAD_MAX_TRACKED,
+    REFRESH_AHEAD_MAX_LIVE_REQUESTS,
+)
+from networksecurity.logging.logger import logging
+from networksecurity.utils.extractor_utils.feature_cache import get_feature_cache
+from networksecurity.utils.extractor_utils.feature_registry import FEATURE_REGISTRY
+from networksecurity.utils.extractor_utils.page_workers import get_page_worker_pool
+
+
+class RefreshAhead:
+    """
+    Background refresher of the FeatureCache entries requests keep asking
+    for. The extractor reports every request-path lookup with record(); once
+    per interval the entries with at least min_requests recent requests
+    (counts halve every half_life seconds) that expire within lead seconds
+    are extracted again, the hottest first. Refreshing a page entry fetches
+    its redirects and page again; refreshing a domain entry recomputes its
+    features from the WHOIS record and DNS answer, which come from the
+    WhoisCache and DnsResolver caches while those hold them. Those caches
+    are not refreshed ahead, their entries expire on their own.
+
+    Refreshes run on a thread and event loop of their own, their lookups and
+    page analysis on max_concurrency threads of their own: never on the
+    extractor's threads or the page worker processes that serve live
+    requests. The API wraps its extractions in live_request(); a cycle, or
+    a refresh about to start, is skipped while max_live_requests of them
+    are in flight or every page worker is busy.
+
+    A request finding an entry after the time it would have expired without
+    its refresh counts as a prevented miss.
+    """
+
+    def __init__(self, interval: float = REFRESH_AHEAD_INTERVAL, lead: float = REFRESH_AHEAD_LEAD,
+                 min_requests: float = REFRESH_AHEAD_MIN_REQUESTS, half_life: float = REFRESH_AHEAD_HALF_LIFE,
+                 max_concurrency: int = REFRESH_AHEAD_MAX_CONCURRENCY,
+                 max_per_cycle: int = REFRESH_AHEAD_MAX_PER_CYCLE, max_tracked: int = REFRESH_AHEAD_MAX_TRACKED,
+                 max_live_requests: int = REFRESH_AHEAD_MAX_LIVE_REQUESTS):
+        self.interval = interval
+        self.lead = lead
+        self.min_requests = min_requests
+        self.half_life = half_life
+        self.max_concurrency = max_concurrency
+        self.max_per_cycle = max_per_cycle
+        self.max_tracked = max_tracked
+        self.max_live_requests = max_live_requests
+        self.live_requests = 0
+        # (scope, key) -> [decayed request count, last URL requested]
+        self._requests = {}
+        # (scope, key) -> when the entry would have expired without refreshes
+        self._refreshed = {}
+        self._in_flight = set()
+        self._decayed_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.refreshes = 0
+        self.failures = 0
+        self.skipped = 0
+        self.skipped_cycles = 0
+        self.prevented_misses = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def record(self, scope: str, key: str, url: str, hit: bool) -> None:
+        """Count a request-path FeatureCache lookup of key in scope, made for url"""
+        if not self.running:
+            return
+        with self._lock:
+            entry = self._requests.get((scope, key))
+            if entry is None:
+                self._requests[(scope, key)] = [1.0, url]
+            else:
+                entry[0] += 1
+                entry[1] = url
+            expired_at = self._refreshed.get((scope, key))
+            if expired_at is not None and time.time() >= expired_at:
+                del self._refreshed[(scope, key)]
+                if hit:
+                    self.prevented_misses += 1
+
+    @contextmanager
+    def live_request(self):
+        """Count a live extraction as in flight for its duration, see busy"""
+        with self._lock:
+            self.live_requests += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.live_requests -= 1
+
+    @property
+    def busy(self) -> bool:
+        """True while live requests need every resource: refreshes wait"""
+        page_workers = get_page_worker_pool()
+        return (self.live_requests >= self.max_live_requests
+                or page_workers.enabled and page_workers.in_flight >= page_workers.max_workers)
+
+    def _decay(self) -> None:
+        now = time.monotonic()
+        factor = 0.5 ** ((now - self._decayed_at) / self.half_life)
+        self._decayed_at = now
+        for key, entry in list(self._requests.items()):
+            entry[0] *= factor
+            if entry[0] < 0.1:
+                del self._requests[key]
+        if len(self._requests) > self.max_tracked:
+            coldest = sorted(self._requests, key=lambda key: self._requests[key][0])
+            for key in coldest[:len(self._requests) - self.max_tracked]:
+                del self._requests[key]
+        for key in [key for key in self._refreshed if key not in self._requests]:
+            del self._refreshed[key]
+
+    def _due(self) -> list:
+        """(scope, key, url) of the hot entries expiring within lead seconds, hottest first"""
+        cache = get_feature_cache()
+        now = time.time()
+        due = []
+        with self._lock:
+            self._decay()
+            hottest = sorted(self._requests.items(), key=lambda item: item[1][0], reverse=True)
+            for (scope, key), (count, url) in hottest:
+                if count < self.min_requests or len(due) >= self.max_per_cycle:
+                    break
+                expires_at = cache.expires_at(scope, key)
+                # entries not cached are filled by the next request
+                if expires_at is None or expires_at - now > self.lead or (scope, key) in self._in_flight:
+                    continue
+                self._in_flight.add((scope, key))
+                due.append((scope, key, url))
+        return due
+
+    async def _refresh(self, scope: str, key: str, url: str, semaphore: asyncio.Semaphore, executor) -> None:
+        # imported here: the extractor imports this module to record its lookups
+        from networksecurity.utils.feature_extractor import extract_features_from_url_async
+
+        cache = get_feature_cache()
+        try:
+            async with semaphore:
+                expires_at = cache.expires_at(scope, key)
+                if expires_at is None:
+                    return
+                if self.busy:
+                    self.skipped += 1
+                    return
+                names = [name for name in URL_FEATURE_NAMES if FEATURE_REGISTRY.providers[name].scope == scope]
+                try:
+                    await extract_features_from_url_async(url, feature_names=names, refresh_cache=True,
+                                                          executor=executor)
+                except Exception as e:
+                    logging.info(f"Refreshing the {scope} features of {key} failed: {e}")
+                    self.failures += 1
+                    return
+                refreshed_until = cache.expires_at(scope, key)
+                if refreshed_until is None or refreshed_until <= expires_at:
+                    # e.g. the page could not be fetched, which is not cached
+                    self.failures += 1
+                    return
+                self.refreshes += 1
+                with self._lock:
+                    self._refreshed.setdefault((scope, key), expires_at)
+        finally:
+            with self._lock:
+                self._in_flight.discard((scope, key))
+
+    async def _run(self) -> None:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="refresh-ahead")
+        tasks = set()
+        while not self._stop.is_set():
+            if self.busy:
+                self.skipped_cycles += 1
+            else:
+                for scope, key, url in self._due():
+                    task = asyncio.ensure_future(self._refresh(scope, key, url, semaphore, executor))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            await asyncio.sleep(self.interval)
+        for task in tasks:
+            task.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def start(self) -> None:
+        """Start refreshing in the background; record() counts nothing before"""
+        with self._lock:
+            if self.running:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=asyncio.run, args=(self._run(),),
+                                            name="refresh-ahead", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> dict:
+        return {
+            "tracked": len(self._requests),
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "skipped_cycles": self.skipped_cycles,
+            "prevented_misses": self.prevented_misses,
+        }
+
+    def render_metrics(self) -> list:
+        """Counters in the Prometheus text format, see instrumentation.render_metrics"""
+        stats = self.stats()
+        name = "extractor_refresh_ahead_total"
+        lines = [f"# HELP {name} Background refreshes of hot FeatureCache entries by result",
+                 f"# TYPE {name} counter"]
+        for result in ("refreshes", "failures", "skipped"):
+            lines.append(f'{name}{{result="{result}"}} {stats[result]}')
+        name = "extractor_refresh_ahead_skipped_cycles_total"
+        lines += [f"# HELP {name} Refresh cycles skipped while live requests kept the extractor busy",
+                  f"# TYPE {name} counter", f"{name} {stats['skipped_cycles']}"]
+        name = "extractor_refresh_ahead_prevented_misses_total"
+        lines += [f"# HELP {name} Request-path cache misses avoided by refreshing ahead",
+                  f"# TYPE {name} counter", f"{name} {stats['prevented_misses']}"]
+        return lines
+
+
+_refresh_ahead = None
+_refresh_ahead_lock = threading.Lock()
+
+
+def get_refresh_ahead() -> RefreshAhead:
+    """Process wide RefreshAhead, started by the API and idle otherwise"""
+    global _refresh_ahead
+    if _refresh_ahead is None:
+        with _refresh_ahead_lock:
+            if _refresh_ahead is None:
+                _refresh_ahead = RefreshAhead()
+    return _refresh_ahead
@@ -0,0 +1,350 @@
+"""
+Record the HTTP, WHOIS and DNS traffic of the feature extractor into a
+fixture file and replay it offline.
+
+    python -m networksecurity.utils.extractor_utils.replay_harness record urls.txt -o fixtures.json
+    python -m networksecurity.utils.extractor_utils.replay_harness replay fixtures.json
+
+While replaying, pages are served by a local HTTP stand-in server through the
+extractor's real fetch path (connection pools, streaming, decoding), DNS and
+WHOIS answers come from stubbed resolvers, and anything that was not recorded
+fails like an unreachable host. Domain ages are taken at the time the
+fixtures were recorded, so they do not drift. Replaying compares the features with the ones
+recorded, so extractor changes can be checked for regressions without the
+network. benchmarks/bench_extractor.py builds on it.
+"""
+import argparse
+import base64
+import io
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import quote, unquote
+
+import requests
+import whois
+from urllib3 import HTTPResponse
+from urllib3._collections import HTTPHeaderDict
+from whois.parser import WhoisEntry
+
+from networksecurity.constant.feature_extractor import PAGE_DOWNLOAD_MAX_BYTES
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.utils.extractor_utils import (
+    dns_resolver, feature_cache, host_breaker, http_fetcher, page_digest_cache, whois_cache,
+)
+from networksecurity.utils.extractor_utils.dns_resolver import DnsResolver
+from networksecurity.utils.extractor_utils.feature_cache import FeatureCache
+from networksecurity.utils.extractor_utils.host_breaker import HostCircuitBreaker
+from networksecurity.utils.extractor_utils.http_fetcher import ResolvedHostAdapter
+from networksecurity.utils.extractor_utils.page_digest_cache import PageDigestCache
+from networksecurity.utils.extractor_utils.whois_cache import WhoisCache
+
+FIXTURES_VERSION = 1
+
+# headers that describe the recorded connection, not the response; the
+# stand-in server sends the body in one piece with its own Content-Length
+_HOP_BY_HOP_HEADERS = {"connection", "keep-alive", "transfer-encoding", "content-length"}
+
+
+@dataclass
+class ExtractorFixtures:
+    """
+    Everything the extractor saw for a set of URLs:
+
+    - http: request URL -> {"status", "headers", "body" (base64 of the bytes
+      on the wire), "seconds"}, or {"error", "seconds"} when the request failed
+    - whois: registered domain -> raw WHOIS text, None when the lookup failed
+    - dns: host -> IPv4 addresses, None when it did not resolve
+    - features: URL -> the 30 features extracted while recording
+    - recorded_at: local time the recording started (ISO 8601), the time
+      age_of_domain measures against while replaying. Files recorded
+      before it was kept replay against the current time.
+    """
+    http: dict = field(default_factory=dict)
+    whois: dict = field(default_factory=dict)
+    dns: dict = field(default_factory=dict)
+    features: dict = field(default_factory=dict)
+    recorded_at: Optional[str] = None
+
+    @classmethod
+    def load(cls, file_path: str) -> "ExtractorFixtures":
+        with open(file_path) as file:
+            data = json.load(file)
+        if data.get("version") != FIXTURES_VERSION:
+            raise ValueError(f"{file_path} is not a version {FIXTURES_VERSION} extractor fixture file")
+        return cls(http=data["http"], whois=data["whois"], dns=data["dns"], features=data["features"],
+                   recorded_at=data.get("recorded_at"))
+
+    def save(self, file_path: str) -> None:
+        with open(file_path, "w") as file:
+            json.dump({"version": FIXTURES_VERSION, "http": self.http, "whois": self.whois,
+                       "dns": self.dns, "features": self.features, "recorded_at": self.recorded_at},
+                      file, indent=1)
+
+
+def _response_headers(headers) -> HTTPHeaderDict:
+    return HTTPHeaderDict([(name, value) for name, value in headers.items()
+                           if name.lower() not in _HOP_BY_HOP_HEADERS])
+
+
+class RecordingAdapter(ResolvedHostAdapter):
+    """Sends requests to the network and records every exchange, redirect hops included"""
+
+    def __init__(self, fixtures: ExtractorFixtures, **kwargs):
+        super().__init__(**kwargs)
+        self.fixtures = fixtures
+
+    def send(self, request, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = super().send(request, **kwargs)
+            # the body as it came off the wire, at most what the fetcher would keep
+            body = response.raw.read(PAGE_DOWNLOAD_MAX_BYTES, decode_content=False)
+        except Exception as e:
+            self.fixtures.http[request.url] = {"error": type(e).__name__, "seconds": time.perf_counter() - start}
+            raise
+
+        headers = _response_headers(response.raw.headers)
+        self.fixtures.http[request.url] = {
+            "status": response.status_code,
+            "headers": list(headers.items()),
+            "body": base64.b64encode(body).decode("ascii"),
+            "seconds": time.perf_counter() - start,
+        }
+        # hand the caller the bytes already read; the rest of a capped body
+        # is still on the wire, so the connection is not reused
+        response.close()
+        response.raw = HTTPResponse(
+            body=io.BytesIO(body), headers=headers, status=response.status_code,
+            preload_content=False, decode_content=False,
+        )
+        return response
+
+
+def _recorded_error(name: str, request) -> Exception:
+    error_class = getattr(requests.exceptions, name, None)
+    if not (isinstance(error_class, type) and issubclass(error_class, requests.RequestException)):
+        error_class = requests.ConnectionError
+    return error_class(f"recorded {name} for {request.url}", request=request)
+
+
+class ReplayAdapter(ResolvedHostAdapter):
+    """Sends every recorded request to the stand-in server instead of its host"""
+
+    def __init__(self, fixtures: ExtractorFixtures, server_url: str, **kwargs):
+        super().__init__(**kwargs)
+        self.fixtures = fixtures
+        self.server_url = server_url
+
+    def send(self, request, **kwargs):
+        exchange = self.fixtures.http.get(request.url)
+        if exchange is None:
+            raise requests.ConnectionError(f"{request.url} was not recorded", request=request)
+        if "error" in exchange:
+            raise _recorded_error(exchange["error"], request)
+
+        url = request.url
+        request.url = f"{self.server_url}/{quote(url, safe='')}"
+        try:
+            response = super().send(request, **kwargs)
+        finally:
+            request.url = url
+        response.url = url
+        return response
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        exchange = self.server.fixtures.http.get(unquote(self.path[1:]))
+        if exchange is None or "error" in exchange:
+            self.send_error(502)
+            return
+
+        if self.server.latency:
+            time.sleep(exchange["seconds"] * self.server.latency)
+        body = base64.b64decode(exchange["body"])
+        self.send_response(exchange["status"])
+        for name, value in exchange["headers"]:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StandInServer(ThreadingHTTPServer):
+    """
+    Local HTTP server answering with the recorded responses. latency scales
+    the recorded response times, 0 answers at once.
+    """
+    daemon_threads = True
+
+    def __init__(self, fixtures: ExtractorFixtures, latency: float = 0.0):
+        super().__init__(("127.0.0.1", 0), _StandInHandler)
+        self.fixtures = fixtures
+        self.latency = latency
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def handle_error(self, request, client_address):
+        # the fetcher hangs up on bodies it truncates
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class RecordingResolver(DnsResolver):
+    def __init__(self, fixtures: ExtractorFixtures, **kwargs):
+        super().__init__(**kwargs)
+        self.fixtures = fixtures
+
+    async def _query(self, host: str):
+        try:
+            addresses, ttl, size = await super()._query(host)
+        except Exception:
+            self.fixtures.dns[host] = None
+            raise
+        self.fixtures.dns[host] = list(addresses)
+        return addresses, ttl, size
+
+
+class ReplayResolver(DnsResolver):
+    def __init__(self, fixtures: ExtractorFixtures, **kwargs):
+        super().__init__(**kwargs)
+        self.fixtures = fixtures
+
+    async def _query(self, host: str):
+        addresses = self.fixtures.dns.get(host)
+        if addresses is None:
+            raise LookupError(f"no recorded DNS answer for {host}")
+        return tuple(addresses), self.max_ttl, None
+
+
+@contextmanager
+def _extractor_components(adapter, resolver, whois_lookup, now=None):
+    """
+    Swap the extractor's process wide components, with cold caches, for the
+    duration, and pin the time age_of_domain reads to now when it is given
+    """
+    # imported here: the extractor imports this package
+    from networksecurity.utils import feature_extractor
+
+    saved = (http_fetcher._http_adapter, dns_resolver._dns_resolver, whois_cache._whois_cache,
+             feature_cache._feature_cache, host_breaker._host_breaker, page_digest_cache._page_digest_cache,
+             feature_extractor._now)
+    http_fetcher._http_adapter = adapter
+    dns_resolver._dns_resolver = resolver
+    whois_cache._whois_cache = WhoisCache(lookup=whois_lookup)
+    feature_cache._feature_cache = FeatureCache()
+    host_breaker._host_breaker = HostCircuitBreaker()
+    page_digest_cache._page_digest_cache = PageDigestCache()
+    if now is not None:
+        feature_extractor._now = lambda: now
+    try:
+        yield
+    finally:
+        (http_fetcher._http_adapter, dns_resolver._dns_resolver, whois_cache._whois_cache,
+         feature_cache._feature_cache, host_breaker._host_breaker, page_digest_cache._page_digest_cache,
+         feature_extractor._now) = saved
+
+
+@contextmanager
+def recording(fixtures: ExtractorFixtures):
+    """Run the extractor against the network, recording its traffic into fixtures"""
+
+    def whois_lookup(domain):
+        try:
+            entry = whois.whois(domain)
+        except Exception:
+            fixtures.whois[domain] = None
+            raise
+        fixtures.whois[domain] = entry.text
+        return entry
+
+    fixtures.recorded_at = datetime.now().isoformat()
+    with _extractor_components(RecordingAdapter(fixtures), RecordingResolver(fixtures), whois_lookup):
+        yield fixtures
+
+
+@contextmanager
+def replaying(fixtures: ExtractorFixtures, latency: float = 0.0):
+    """Run the extractor against fixtures only, see StandInServer for latency"""
+
+    def whois_lookup(domain):
+        text = fixtures.whois.get(domain)
+        if text is None:
+            raise LookupError(f"no recorded WHOIS record for {domain}")
+        return WhoisEntry.load(domain, text)
+
+    now = datetime.fromisoformat(fixtures.recorded_at) if fixtures.recorded_at else None
+    server = StandInServer(fixtures, latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with _extractor_components(ReplayAdapter(fixtures, server.url), ReplayResolver(fixtures), whois_lookup,
+                                   now):
+            yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def replay_mismatches(fixtures: ExtractorFixtures, features: dict) -> dict:
+    """URL -> (recorded, replayed) for every URL whose features differ from the recording"""
+    return {url: (recorded, features.get(url)) for url, recorded in fixtures.features.items()
+            if list(features.get(url) or []) != list(recorded)}
+
+
+def main():
+    # imported here: batch_extractor imports the extractor, which imports this package
+    from networksecurity.utils.extractor_utils.batch_extractor import extract_features_batch
+
+    parser = argparse.ArgumentParser(description="Record or replay the feature extractor's network traffic")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record_parser = commands.add_parser("record", help="extract features live and record the traffic")
+    record_parser.add_argument("input", help="text file with one URL per line")
+    record_parser.add_argument("-o", "--output", default="extractor_fixtures.json", help="fixture file to write")
+    replay_parser = commands.add_parser("replay", help="extract features from a fixture file and compare")
+    replay_parser.add_argument("fixtures", help="fixture file written by record")
+    replay_parser.add_argument("--latency", type=float, default=0.0, help="scale of the recorded response times")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "record":
+            with open(args.input) as file:
+                urls = [line.strip() for line in file if line.strip()]
+            fixtures = ExtractorFixtures()
+            with recording(fixtures):
+                dataframe = extract_features_batch(urls)
+            fixtures.features = {url: [int(value) for value in row] for url, row in zip(urls, dataframe.values)}
+            fixtures.save(args.output)
+            print(f"Recorded {len(fixtures.http)} HTTP exchanges, {len(fixtures.whois)} WHOIS records "
+                  f"and {len(fixtures.dns)} DNS answers for {len(urls)} URLs to {args.output}")
+            return
+
+        fixtures = ExtractorFixtures.load(args.fixtures)
+        urls = list(fixtures.features)
+        with replaying(fixtures, args.latency):
+            dataframe = extract_features_batch(urls)
+        mismatches = replay_mismatches(fixtures, {url: list(row) for url, row in zip(urls, dataframe.values)})
+        for url, (recorded, replayed) in mismatches.items():
+            print(f"{url}: recorded {recorded}, replayed {replayed}")
+        print(f"{len(urls) - len(mismatches)} of {len(urls)} URLs match the recording")
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import asyncio
+import threading
+import weakref
+from urllib.parse import urlsplit, urlunsplit
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    url with what does not change the response normalized away: scheme and
+    host lowercased, the default port and the fragment dropped
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port is not None and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    if parts.username or parts.password:
+        host = f"{parts.netloc.rsplit('@', 1)[0]}@{host}"
+    return urlunsplit((scheme, host, parts.path or "/", parts.query, ""))
+
+
+class Singleflight:
+    """
+    Coalesces concurrent calls for the same key: do(key, start) joins the
+    task already running for key, or runs start() as that task. The key is
+    forgotten once its task is done, so later calls start afresh and read
+    the result from the caches behind it.
+
+    Tasks belong to an event loop, so every loop has its own keys. Callers
+    get the task shielded: a caller that gives up does not cancel it for
+    the others.
+    """
+
+    def __init__(self):
+        self._flights = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.started = 0
+        self.joined = 0
+
+    def do(self, key, start):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            flights = self._flights.get(loop)
+            if flights is None:
+                flights = self._flights[loop] = {}
+            task = flights.get(key)
+            if task is None:
+                task = flights[key] = asyncio.ensure_future(start())
+                self.started += 1
+
+                def forget(done_task):
+                    if flights.get(key) is done_task:
+                        del flights[key]
+                task.add_done_callback(forget)
+            else:
+                self.joined += 1
+        return asyncio.shield(task)
+
+    def stats(self) -> dict:
+        calls = self.started + self.joined
+        return {
+            "started": self.started,
+            "joined": self.joined,
+            "join_rate": self.joined / calls if calls else 0.0,
+        }
+
+    def render_metrics(self) -> list:
+        """Counters in the Prometheus text format, see instrumentation.render_metrics"""
+        name = "extractor_singleflight_total"
+        return [f"# HELP {name} WHOIS, DNS and page lookups started, or joined while already running",
+                f"# TYPE {name} counter",
+                f'{name}{{result="started"}} {self.started}',
+                f'{name}{{result="joined"}} {self.joined}']
+
+
+_singleflight = None
+_singleflight_lock = threading.Lock()
+
+
+def get_singleflight() -> Singleflight:
+    """Process wide Singleflight for the lookups of extract_features_from_url_async"""
+    global _singleflight
+    if _singleflight is None:
+        with _singleflight_lock:
+            if _singleflight is None:
+                _singleflight = Singleflight()
+    return _singleflight
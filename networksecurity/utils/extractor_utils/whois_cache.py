@@ -0,0 +1,124 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+import whois
+
+from networksecurity.constant.feature_extractor import (
+    EXTRACTOR_CACHE_DIR,
+    WHOIS_CACHE_FILE_NAME,
+    WHOIS_CACHE_MEMORY_SIZE,
+    WHOIS_CACHE_TTL,
+    WHOIS_CACHE_FAILURE_TTL,
+)
+from networksecurity.logging.logger import logging
+from networksecurity.utils.extractor_utils.domain_utils import registered_domain
+from networksecurity.utils.extractor_utils.ttl_cache import TTLCache, MISSING
+
+
+class WhoisCache:
+    """
+    Two level cache for WHOIS records keyed by registered domain: an
+    in-process LRU in front of a SQLite file that survives restarts and is
+    shared by every worker process pointing at the same path.
+
+    Failed lookups are cached as None with their own, shorter TTL.
+    """
+
+    def __init__(self, file_path: str = None, memory_size: int = WHOIS_CACHE_MEMORY_SIZE,
+                 ttl: float = WHOIS_CACHE_TTL, failure_ttl: float = WHOIS_CACHE_FAILURE_TTL,
+                 lookup=None):
+        self.file_path = file_path
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.lookup = lookup or whois.whois
+        self.memory = TTLCache(maxsize=memory_size, ttl=ttl)
+        self._local = threading.local()
+
+        if self.file_path:
+            dir_path = os.path.dirname(self.file_path)
+            if dir_path:
+                os.makedirs(dir_path, exist_ok=True)
+            with self._connection() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS whois_cache ("
+                    "domain TEXT PRIMARY KEY, expires_at REAL NOT NULL, payload BLOB)"
+                )
+                conn.execute("DELETE FROM whois_cache WHERE expires_at <= ?", (time.time(),))
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.file_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _read_disk(self, key: str):
+        try:
+            row = self._connection().execute(
+                "SELECT expires_at, payload FROM whois_cache WHERE domain = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        except Exception as e:
+            logging.info(f"WHOIS cache read failed for {key}: {e}")
+            return MISSING, None
+        if row is None:
+            return MISSING, None
+        expires_at, payload = row
+        return (pickle.loads(payload) if payload is not None else None), expires_at
+
+    def _write_disk(self, key: str, value, expires_at: float) -> None:
+        try:
+            payload = pickle.dumps(value) if value is not None else None
+            with self._connection() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO whois_cache (domain, expires_at, payload) VALUES (?, ?, ?)",
+                    (key, expires_at, payload),
+                )
+        except Exception as e:
+            logging.info(f"WHOIS cache write failed for {key}: {e}")
+
+    def get(self, domain: str):
+        """WHOIS record for the registered domain of domain, or None if the lookup fails"""
+        key = registered_domain(domain)
+
+        value = self.memory.get(key)
+        if value is not MISSING:
+            return value
+
+        if self.file_path:
+            value, expires_at = self._read_disk(key)
+            if value is not MISSING:
+                self.memory.set(key, value, expires_at=expires_at)
+                return value
+
+        try:
+            value = self.lookup(key)
+            ttl = self.ttl
+        except Exception:
+            value = None
+            ttl = self.failure_ttl
+
+        expires_at = time.time() + ttl
+        self.memory.set(key, value, expires_at=expires_at)
+        if self.file_path:
+            self._write_disk(key, value, expires_at)
+        return value
+
+
+_whois_cache = None
+_whois_cache_lock = threading.Lock()
+
+
+def get_whois_cache() -> WhoisCache:
+    """Process wide WhoisCache stored under EXTRACTOR_CACHE_DIR"""
+    global _whois_cache
+    if _whois_cache is None:
+        with _whois_cache_lock:
+            if _whois_cache is None:
+                _whois_cache = WhoisCache(file_path=os.path.join(EXTRACTOR_CACHE_DIR, WHOIS_CACHE_FILE_NAME))
+    return _whois_cache
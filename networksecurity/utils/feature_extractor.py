@@ -1,15 +1,446 @@
 from urllib.parse import urlparse
 import re
-import whois
-import tldextract
 from datetime import datetime
-import socket
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from networksecurity.constant.feature_extractor import (
+    EXTRACTOR_MAX_WORKER_THREADS,
+    URL_FEATURE_NAMES,
+    LEXICAL_FEATURE_NAMES,
+    FEATURE_CACHE_ENABLED,
+    PAGE_DIGEST_CACHE_ENABLED,
+)
+from networksecurity.utils.extractor_utils.http_fetcher import fetch_url, CIRCUIT_OPEN_ERROR
+from networksecurity.utils.extractor_utils.whois_cache import get_whois_cache
+from networksecurity.utils.extractor_utils.dns_resolver import get_dns_resolver
+from networksecurity.utils.extractor_utils.domain_utils import registered_domain, split_domain
+from networksecurity.utils.extractor_utils.dom_features import dom_digest_features, DOM_FEATURE_FALLBACKS
+from networksecurity.utils.extractor_utils.page_digest_cache import get_page_digest_cache, page_hash
+from networksecurity.utils.extractor_utils.page_workers import (
+    PAGE_ANALYSES,
+    PageWorkersOverloaded,
+    analysis_nbytes,
+    get_page_worker_pool,
+)
+from networksecurity.utils.extractor_utils.ttl_cache import MISSING
+from networksecurity.logging.logger import logging
+from networksecurity.utils.extractor_utils.page_scanner import extract_page_text_features, PAGE_TEXT_FEATURE_NAMES
+from networksecurity.utils.extractor_utils.feature_cache import get_feature_cache
+from networksecurity.utils.extractor_utils.refresh_ahead import get_refresh_ahead
+from networksecurity.utils.extractor_utils.singleflight import get_singleflight, normalize_url
+from networksecurity.utils.extractor_utils.instrumentation import (
+    NO_TRACE,
+    OUTCOME_OK,
+    OUTCOME_ERROR,
+    OUTCOME_FALLBACK,
+    OUTCOME_CACHED,
+    OUTCOME_TIMEOUT,
+    error_outcome,
+)
+from networksecurity.utils.extractor_utils.feature_registry import (
+    FEATURE_REGISTRY,
+    FeatureContext,
+    RESOURCE_URL,
+    RESOURCE_DOMAIN,
+    RESOURCE_WHOIS,
+    RESOURCE_DNS,
+    RESOURCE_PAGE,
+    RESOURCE_REDIRECTS,
+    NETWORK_RESOURCES,
+)
+import time
 import warnings
 warnings.filterwarnings("ignore")
 
-def extract_features_from_url(url: str) -> list:
+# blocking lookups run here so the event loop never waits on them
+_blocking_executor = ThreadPoolExecutor(
+    max_workers=EXTRACTOR_MAX_WORKER_THREADS, thread_name_prefix="feature-extractor"
+)
+
+
+def _prepare_url(url: str):
+    """Normalise the URL and split out the domain parts the features work on"""
+    # Ensure URL has a scheme
+    if not url.startswith(('http://', 'https://')):
+        url = 'http://' + url
+    
+    parsed_url = urlparse(url)
+    domain = parsed_url.netloc.lower()
+    
+    # Clean domain (remove www and port)
+    clean_domain = domain.replace('www.', '') if domain.startswith('www.') else domain
+    clean_domain = clean_domain.split(':')[0]
+    
+    return url, parsed_url, domain, clean_domain
+
+
+def having_IP_Address(url):
+    """1. Check if URL contains IP address instead of domain name"""
+    ip_pattern = r'((25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)'
+    return -1 if re.search(ip_pattern, url) else 1
+
+
+def URL_Length(url):
+    """2. Check URL length"""
+    if len(url) < 54:
+        return 1  # Short - legitimate
+    elif len(url) < 75:
+        return 0  # Medium - suspicious  
+    else:
+        return -1  # Long - phishing
+
+
+def Shortining_Service(url):
+    """3. Check if URL uses shortening services"""
+    shortening_services = [
+        'bit.ly', 'goo.gl', 'shorte.st', 'x.co', 'ow.ly', 'tinyurl.com',
+        't.co', 'bit.do', 'adf.ly', 'bitly.com', 'short.to', 'rb.gy',
+        'cutt.ly', 'is.gd', 'buff.ly', 'tiny.cc', 'lnkd.in'
+    ]
+    for service in shortening_services:
+        if service in url.lower():
+            return -1
+    return 1
+
+
+def having_At_Symbol(url):
+    """4. Check for @ symbol in URL"""
+    return -1 if '@' in url else 1
+
+
+def double_slash_redirecting(url):
+    """5. Check for double slash after domain"""
+    # Remove the initial http:// or https://
+    if url.startswith('http://'):
+        remaining = url[7:]
+    elif url.startswith('https://'):
+        remaining = url[8:]
+    else:
+        remaining = url
+
+    # Find first single slash (end of domain part)
+    first_slash = remaining.find('/')
+    if first_slash != -1:
+        after_domain = remaining[first_slash:]
+        if '//' in after_domain:
+            return -1
+    return 1
+
+
+def Prefix_Suffix(domain):
+    """6. Check for dash in domain name"""
+    clean_domain_name = domain.split(':')[0]  # Remove port
+    return -1 if '-' in clean_domain_name else 1
+
+
+def having_Sub_Domain(url):
+    """7. Check number of subdomains"""
+    try:
+        ext = split_domain(url)
+        subdomain = ext.subdomain
+        if not subdomain:
+            return 1  # No subdomain
+
+        subdomain_count = subdomain.count('.') + 1
+        if subdomain_count == 1:
+            return 1   # One subdomain - legitimate
+        elif subdomain_count == 2:
+            return 0   # Two subdomains - suspicious
+        else:
+            return -1  # Multiple subdomains - phishing
+    except:
+        return -1
+
+
+def SSLfinal_State(url, domain):
+    """8. Check SSL certificate status"""
+    if not url.startswith('https://'):
+        return -1  # No HTTPS
+
+    # Additional check for suspicious HTTPS usage
+    if 'https' in domain.lower() and not url.startswith('https://'):
+        return -1  # HTTPS in domain name but not using HTTPS
+
+    return 1  # Using HTTPS properly
+
+
+def port(parsed_url):
+    """11. Check for non-standard ports"""
+    try:
+        port_num = parsed_url.port
+        if port_num is None:
+            return 1  # Standard port (80/443)
+        elif port_num in [80, 443]:
+            return 1  # Standard ports
+        else:
+            return -1  # Non-standard port
+    except:
+        return 1
+
+
+def HTTPS_token(url, parsed_url):
+    """12. Check for HTTPS token in domain"""
+    domain_part = parsed_url.netloc.lower()
+    if 'https' in domain_part and not url.startswith('https://'):
+        return -1  # HTTPS in domain but not using HTTPS
+    return 1
+
+
+def extract_lexical_features(url: str) -> list:
+    """
+    Features computed from the URL string alone, without any network access,
+    in the order of LEXICAL_FEATURE_NAMES (features 1-8, 11 and 12).
+    """
+    try:
+        url, parsed_url, domain, clean_domain = _prepare_url(url)
+    except Exception:
+        return [-1] * len(LEXICAL_FEATURE_NAMES)
+    
+    return [
+        having_IP_Address(url),
+        URL_Length(url),
+        Shortining_Service(url),
+        having_At_Symbol(url),
+        double_slash_redirecting(url),
+        Prefix_Suffix(domain),
+        having_Sub_Domain(url),
+        SSLfinal_State(url, domain),
+        port(parsed_url),
+        HTTPS_token(url, parsed_url),
+    ]
+
+
+def get_whois_info(domain):
+    """Helper function to get WHOIS information, cached per registered domain"""
+    try:
+        return get_whois_cache().get(domain)
+    except:
+        return None
+
+
+def Domain_registeration_length(whois_info):
+    """9. Check domain registration length"""
+    try:
+        if whois_info and whois_info.expiration_date and whois_info.creation_date:
+            exp_date = whois_info.expiration_date
+            create_date = whois_info.creation_date
+            
+            # Handle list format
+            if isinstance(exp_date, list):
+                exp_date = exp_date[0]
+            if isinstance(create_date, list):
+                create_date = create_date[0]
+            
+            if isinstance(exp_date, datetime) and isinstance(create_date, datetime):
+                reg_length = (exp_date - create_date).days
+                return 1 if reg_length >= 365 else -1
+        
+        return -1  # Suspicious if no registration info
+    except:
+        return -1
+
+
+def Abnormal_URL(whois_info, clean_domain):
+    """18. Check if URL appears in WHOIS info"""
+    if not whois_info:
+        return -1  # No WHOIS info - suspicious
+    
+    try:
+        whois_text = str(whois_info).lower()
+        domain_name = clean_domain.lower()
+        
+        # Check if domain appears in WHOIS info
+        if domain_name in whois_text:
+            return 1  # Domain found in WHOIS - normal
+        else:
+            return -1  # Domain not in WHOIS - abnormal
+    except:
+        return -1
+
+
+def Redirect(fetch_result):
+    """19. Check for redirects"""
+    if not fetch_result.ok:
+        return -1  # Changed from 0 to -1 for stricter security
+    
+    redirect_count = fetch_result.redirect_count
+    if redirect_count <= 1:
+        return 1   # No or few redirects - normal
+    elif redirect_count <= 4:
+        return 0   # Some redirects - suspicious
+    else:
+        return -1  # Many redirects - phishing
+
+
+# the current time as age_of_domain reads it; the replay harness pins it to
+# the time the fixtures were recorded
+_now = datetime.now
+
+
+def age_of_domain(whois_info):
+    """24. Check domain age"""
+    try:
+        if whois_info and whois_info.creation_date:
+            create_date = whois_info.creation_date
+            if isinstance(create_date, list):
+                create_date = create_date[0]
+            
+            if isinstance(create_date, datetime):
+                age_days = (_now() - create_date).days
+                
+                if age_days >= 180:  # 6 months
+                    return 1   # Old domain - legitimate
+                elif age_days >= 30:  # 1 month
+                    return 0   # Medium age - suspicious
+                else:
+                    return -1  # New domain - phishing
+        
+        return -1  # No creation date - suspicious
+    except:
+        return -1
+
+
+def DNSRecord(addresses):
+    """25. Check if domain has DNS record"""
+    return 1 if addresses else -1  # DNS record exists / No DNS record
+
+
+def web_traffic(domain):
+    """26. Website traffic - now more strict"""
+    # Since we can't access external APIs, assume low traffic = suspicious
+    # Most legitimate sites have some traffic data available
+    return -1  # Changed from 0 to -1 for stricter security
+
+
+def Page_Rank(domain):
+    """27. Page rank - now more strict"""
+    # Since we can't access Google PageRank, assume no PageRank = suspicious
+    # Most legitimate sites have some PageRank
+    return -1  # Changed from 0 to -1 for stricter security
+
+
+def Google_Index(url):
+    """28. Check if indexed by Google - now more strict"""
+    # Since we can't check Google indexing, assume not indexed = suspicious
+    # Most legitimate sites are indexed by Google
+    return -1  # Changed from 0 to -1 for stricter security
+
+
+def Links_pointing_to_page(domain):
+    """29. Number of links pointing to page - now more strict"""
+    # Since we can't check backlinks, assume no backlinks = suspicious
+    # Most legitimate sites have some backlinks
+    return -1  # Changed from 0 to -1 for stricter security
+
+
+def Statistical_report(domain):
+    """30. Statistical report based on other security services - now more strict"""
+    # Since we can't check threat intelligence, assume unknown = suspicious
+    # Most legitimate sites have clean reputation
+    return -1  # Changed from 0 to -1 for stricter security
+
+
+def _page_digest_cache(context):
+    """The PageDigestCache with context.page_hash set, None when it is disabled"""
+    if not PAGE_DIGEST_CACHE_ENABLED:
+        return None
+    if context.page_hash is None:
+        context.page_hash = page_hash(context.fetch_result.page_content)
+    return get_page_digest_cache()
+
+
+# the PAGE_ANALYSES result each page feature is computed from
+_PAGE_ANALYSIS_OF_FEATURE = {
+    **{name: 'dom' for name in DOM_FEATURE_FALLBACKS},
+    **{name: 'text' for name in PAGE_TEXT_FEATURE_NAMES},
+}
+
+
+def _page_analysis(context, kind: str):
+    """
+    PAGE_ANALYSES[kind] of the page: as the worker processes computed it,
+    else from the PageDigestCache or computed in this process.
+    """
+    if kind in context.page_analysis:
+        return context.page_analysis[kind]
+    page_content = context.fetch_result.page_content
+    analysis = PAGE_ANALYSES[kind]
+    memo = _page_digest_cache(context)
+    if memo is None:
+        return analysis(page_content)
+    return memo.get_or_compute(
+        (context.page_hash, kind), lambda: analysis(page_content), lambda value: analysis_nbytes(kind, value),
+    )
+
+
+def _dom_features(context) -> dict:
+    """
+    10, 13-16 and 23 from one parse of the page, scored for this page's
+    domain. The page is parsed while it streams in unless the worker
+    processes analyze it.
+    """
+    fetch_result = context.fetch_result
+    page_content = fetch_result.page_content
+    
+    start = time.perf_counter()
+    if not page_content:
+        dom_features = dict(DOM_FEATURE_FALLBACKS)
+    else:
+        dom_features = dom_digest_features(_page_analysis(context, 'dom'), context.clean_domain)
+    context.trace.record_stage('html_parse', fetch_result.parse_seconds + time.perf_counter() - start,
+                               OUTCOME_OK if page_content else OUTCOME_FALLBACK)
+    return dom_features
+
+
+def _page_text_features(context) -> dict:
+    """17 and 20-22 from one scan of the page text"""
+    page_content = context.fetch_result.page_content
+    
+    start = time.perf_counter()
+    if page_content:
+        # no domain in these, shared results are used as they are
+        page_text_features = dict(_page_analysis(context, 'text'))
+    else:
+        page_text_features = extract_page_text_features(page_content)
+    context.trace.record_stage('page_text_scan', time.perf_counter() - start,
+                               OUTCOME_OK if page_content else OUTCOME_FALLBACK)
+    return page_text_features
+
+
+# The 30 model features and the resources each one reads
+FEATURE_REGISTRY.register('having_IP_Address', {RESOURCE_URL}, lambda c: having_IP_Address(c.url))              # 1
+FEATURE_REGISTRY.register('URL_Length', {RESOURCE_URL}, lambda c: URL_Length(c.url))                            # 2
+FEATURE_REGISTRY.register('Shortining_Service', {RESOURCE_URL}, lambda c: Shortining_Service(c.url))            # 3
+FEATURE_REGISTRY.register('having_At_Symbol', {RESOURCE_URL}, lambda c: having_At_Symbol(c.url))                # 4
+FEATURE_REGISTRY.register('double_slash_redirecting', {RESOURCE_URL}, lambda c: double_slash_redirecting(c.url))  # 5
+FEATURE_REGISTRY.register('Prefix_Suffix', {RESOURCE_URL}, lambda c: Prefix_Suffix(c.domain))                   # 6
+FEATURE_REGISTRY.register('having_Sub_Domain', {RESOURCE_URL}, lambda c: having_Sub_Domain(c.url))              # 7
+FEATURE_REGISTRY.register('SSLfinal_State', {RESOURCE_URL}, lambda c: SSLfinal_State(c.url, c.domain))          # 8
+FEATURE_REGISTRY.register('Domain_registeration_length', {RESOURCE_WHOIS},                                      # 9
+                          lambda c: Domain_registeration_length(c.whois_info))
+FEATURE_REGISTRY.register(list(DOM_FEATURE_FALLBACKS), {RESOURCE_PAGE, RESOURCE_DOMAIN}, _dom_features)         # 10, 13-16, 23
+FEATURE_REGISTRY.register('port', {RESOURCE_URL}, lambda c: port(c.parsed_url))                                 # 11
+FEATURE_REGISTRY.register('HTTPS_token', {RESOURCE_URL}, lambda c: HTTPS_token(c.url, c.parsed_url))            # 12
+FEATURE_REGISTRY.register(PAGE_TEXT_FEATURE_NAMES, {RESOURCE_PAGE}, _page_text_features)                        # 17, 20-22
+FEATURE_REGISTRY.register('Abnormal_URL', {RESOURCE_WHOIS, RESOURCE_DOMAIN},                                    # 18
+                          lambda c: Abnormal_URL(c.whois_info, c.clean_domain))
+FEATURE_REGISTRY.register('Redirect', {RESOURCE_REDIRECTS}, lambda c: Redirect(c.fetch_result))                 # 19
+FEATURE_REGISTRY.register('age_of_domain', {RESOURCE_WHOIS}, lambda c: age_of_domain(c.whois_info))             # 24
+FEATURE_REGISTRY.register('DNSRecord', {RESOURCE_DNS}, lambda c: DNSRecord(c.addresses))                        # 25
+# 26-30 have no data source and always use their placeholder
+FEATURE_REGISTRY.register('web_traffic', {RESOURCE_DOMAIN}, lambda c: web_traffic(c.clean_domain),              # 26
+                          placeholder=True)
+FEATURE_REGISTRY.register('Page_Rank', {RESOURCE_DOMAIN}, lambda c: Page_Rank(c.clean_domain),                  # 27
+                          placeholder=True)
+FEATURE_REGISTRY.register('Google_Index', {RESOURCE_URL}, lambda c: Google_Index(c.url), placeholder=True)      # 28
+FEATURE_REGISTRY.register('Links_pointing_to_page', {RESOURCE_DOMAIN},                                          # 29
+                          lambda c: Links_pointing_to_page(c.clean_domain), placeholder=True)
+FEATURE_REGISTRY.register('Statistical_report', {RESOURCE_DOMAIN},                                              # 30
+                          lambda c: Statistical_report(c.clean_domain), placeholder=True)
+
+
+def extract_features_from_url(url: str, feature_names: list = None, time_budget: float = None) -> list:
     """
     Extract features from URL for phishing detection according to the specified feature list.
     Returns a list of 30 features with values: -1 (phishing), 0 (suspicious), 1 (legitimate)
@@ -45,582 +476,329 @@ def extract_features_from_url(url: str) -> list:
     28. Google_Index
     29. Links_pointing_to_page
     30. Statistical_report
-    """
     
-    # Ensure URL has a scheme
-    if not url.startswith(('http://', 'https://')):
-        url = 'http://' + url
+    feature_names: extract only these features, in this order, instead.
+    
+    time_budget: seconds to wait at most; features not finished by then are
+    returned as NaN, see extract_features_from_url_async.
     
+    This is a blocking wrapper around extract_features_from_url_async.
+    """
+    coroutine = extract_features_from_url_async(url, feature_names=feature_names, time_budget=time_budget)
     try:
-        parsed_url = urlparse(url)
-        domain = parsed_url.netloc.lower()
-        path = parsed_url.path
-        
-        # Clean domain (remove www and port)
-        clean_domain = domain.replace('www.', '') if domain.startswith('www.') else domain
-        clean_domain = clean_domain.split(':')[0]
-        
-    except Exception:
-        return [-1] * 30
-    
-    def having_IP_Address(url):
-        """1. Check if URL contains IP address instead of domain name"""
-        ip_pattern = r'((25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)'
-        return -1 if re.search(ip_pattern, url) else 1
-    
-    def URL_Length(url):
-        """2. Check URL length"""
-        if len(url) < 54:
-            return 1  # Short - legitimate
-        elif len(url) < 75:
-            return 0  # Medium - suspicious  
-        else:
-            return -1  # Long - phishing
-    
-    def Shortining_Service(url):
-        """3. Check if URL uses shortening services"""
-        shortening_services = [
-            'bit.ly', 'goo.gl', 'shorte.st', 'x.co', 'ow.ly', 'tinyurl.com',
-            't.co', 'bit.do', 'adf.ly', 'bitly.com', 'short.to', 'rb.gy',
-            'cutt.ly', 'is.gd', 'buff.ly', 'tiny.cc', 'lnkd.in'
-        ]
-        for service in shortening_services:
-            if service in url.lower():
-                return -1
-        return 1
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
     
-    def having_At_Symbol(url):
-        """4. Check for @ symbol in URL"""
-        return -1 if '@' in url else 1
-    
-    def double_slash_redirecting(url):
-        """5. Check for double slash after domain"""
-        # Remove the initial http:// or https://
-        if url.startswith('http://'):
-            remaining = url[7:]
-        elif url.startswith('https://'):
-            remaining = url[8:]
-        else:
-            remaining = url
-        
-        # Find first single slash (end of domain part)
-        first_slash = remaining.find('/')
-        if first_slash != -1:
-            after_domain = remaining[first_slash:]
-            if '//' in after_domain:
-                return -1
-        return 1
+    # Called from inside an event loop: run the extraction on its own loop in a helper thread
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+
+async def extract_features_from_url_async(url: str, domain_lookups: dict = None, trace=None,
+                                          feature_names: list = None, time_budget: float = None,
+                                          shed_load: bool = False, resource_hashes: dict = None,
+                                          refresh_cache: bool = False, executor=None) -> list:
+    """
+    Extract the same 30 features as extract_features_from_url, but start the
+    WHOIS lookup, page download (which also records redirects) and DNS lookup at the same time
+    and await them together, so one URL costs roughly the slowest lookup
+    instead of the sum of all of them.
     
-    def Prefix_Suffix(domain):
-        """6. Check for dash in domain name"""
-        clean_domain_name = domain.split(':')[0]  # Remove port
-        return -1 if '-' in clean_domain_name else 1
+    feature_names: names registered in FEATURE_REGISTRY to extract instead
+    of the 30 features, returned in that order. Only the resources their
+    providers declare are looked up: lexical features alone make no network
+    call, and the page body is only downloaded for features that read it.
     
-    def having_Sub_Domain(url):
-        """7. Check number of subdomains"""
-        try:
-            ext = tldextract.extract(url)
-            subdomain = ext.subdomain
-            if not subdomain:
-                return 1  # No subdomain
-            
-            subdomain_count = subdomain.count('.') + 1
-            if subdomain_count == 1:
-                return 1   # One subdomain - legitimate
-            elif subdomain_count == 2:
-                return 0   # Two subdomains - suspicious
-            else:
-                return -1  # Multiple subdomains - phishing
-        except:
-            return -1
+    domain_lookups: optional dict shared by calls for URLs of the same domain.
+    Each WHOIS and DNS lookup is started once and kept there as a task that
+    every later call awaits instead of looking the domain up again. Without
+    it, concurrent calls join the WHOIS lookup of the same registered domain
+    and the DNS lookup of the same host already in flight.
     
-    def SSLfinal_State(url, domain):
-        """8. Check SSL certificate status"""
-        if not url.startswith('https://'):
-            return -1  # No HTTPS
-        
-        # Additional check for suspicious HTTPS usage
-        if 'https' in domain.lower() and not url.startswith('https://'):
-            return -1  # HTTPS in domain name but not using HTTPS
-        
-        return 1  # Using HTTPS properly
+    Concurrent calls for the same normalized URL always share one page
+    download and analysis, and record the stages of the call they joined.
     
-    def get_whois_info(domain):
-        """Helper function to get WHOIS information"""
-        try:
-            return whois.whois(domain)
-        except:
-            return None
+    Domain and page features are kept in the FeatureCache, and only the
+    lookups behind the scopes it does not have are made.
     
-    def Domain_registeration_length(whois_info):
-        """9. Check domain registration length"""
-        try:
-            if whois_info and whois_info.expiration_date and whois_info.creation_date:
-                exp_date = whois_info.expiration_date
-                create_date = whois_info.creation_date
-                
-                # Handle list format
-                if isinstance(exp_date, list):
-                    exp_date = exp_date[0]
-                if isinstance(create_date, list):
-                    create_date = create_date[0]
-                
-                if isinstance(exp_date, datetime) and isinstance(create_date, datetime):
-                    reg_length = (exp_date - create_date).days
-                    return 1 if reg_length >= 365 else -1
-            
-            return -1  # Suspicious if no registration info
-        except:
-            return -1
+    trace: optional ExtractionTrace that receives the time, outcome and bytes
+    of every lookup and every feature.
     
-    def get_page_content(url):
-        """Helper function to get page content"""
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=10, verify=False)
-            return response.text if response.status_code == 200 else None
-        except:
-            return None
-    
-    def Favicon(url, page_content):
-        """10. Check favicon source"""
-        if not page_content:
-            return -1  # Changed from 0 to -1 for stricter security
-        
-        try:
-            soup = BeautifulSoup(page_content, 'html.parser')
-            favicon_links = soup.find_all('link', rel=lambda x: x and 'icon' in x.lower())
-            
-            if not favicon_links:
-                return -1  # No favicon
-            
-            for link in favicon_links:
-                href = link.get('href', '')
-                if href:
-                    # Check if favicon is from external domain
-                    if href.startswith('http') and clean_domain not in href:
-                        return -1  # External favicon - suspicious
-            
-            return 1  # Favicon from same domain
-        except:
-            return -1  # Changed from 0 to -1
+    time_budget: seconds the call may take. Features whose lookups or page
+    analysis are not finished by then are returned as NaN, for the
+    preprocessor's KNNImputer to fill in; the lookups themselves keep
+    running and fill the caches for later calls. None or 0 waits for all.
     
-    def port(url):
-        """11. Check for non-standard ports"""
-        try:
-            port_num = parsed_url.port
-            if port_num is None:
-                return 1  # Standard port (80/443)
-            elif port_num in [80, 443]:
-                return 1  # Standard ports
-            else:
-                return -1  # Non-standard port
-        except:
-            return 1
-    
-    def HTTPS_token(url):
-        """12. Check for HTTPS token in domain"""
-        domain_part = parsed_url.netloc.lower()
-        if 'https' in domain_part and not url.startswith('https://'):
-            return -1  # HTTPS in domain but not using HTTPS
-        return 1
+    shed_load: raise PageWorkersOverloaded when the page worker processes
+    are full, instead of analyzing the page in this process.
     
-    def Request_URL(page_content, domain):
-        """13. Check percentage of external requests"""
-        if not page_content:
-            return -1  # Changed from 0 to -1 for stricter security
-        
-        try:
-            soup = BeautifulSoup(page_content, 'html.parser')
-            
-            # Find all elements with src or href attributes
-            elements = soup.find_all(['img', 'script', 'link', 'iframe', 'embed', 'object'])
-            
-            total_requests = 0
-            external_requests = 0
-            
-            for element in elements:
-                src = element.get('src') or element.get('href')
-                if src:
-                    total_requests += 1
-                    if src.startswith('http') and domain not in src:
-                        external_requests += 1
-            
-            if total_requests == 0:
-                return 1
-            
-            external_percentage = external_requests / total_requests
-            
-            if external_percentage < 0.22:
-                return 1   # Low external requests - legitimate
-            elif external_percentage < 0.61:
-                return 0   # Medium external requests - suspicious
-            else:
-                return -1  # High external requests - phishing
-        except:
-            return -1  # Changed from 0 to -1
-    
-    def URL_of_Anchor(page_content, domain):
-        """14. Check anchor URLs"""
-        if not page_content:
-            return -1  # Changed from 0 to -1 for stricter security
-        
-        try:
-            soup = BeautifulSoup(page_content, 'html.parser')
-            anchors = soup.find_all('a', href=True)
-            
-            if not anchors:
-                return 1
-            
-            total_anchors = len(anchors)
-            suspicious_anchors = 0
-            
-            for anchor in anchors:
-                href = anchor.get('href', '')
-                if href in ['#', 'javascript:void(0)', 'javascript:;', '']:
-                    suspicious_anchors += 1
-                elif href.startswith('http') and domain not in href:
-                    suspicious_anchors += 1
-            
-            suspicious_percentage = suspicious_anchors / total_anchors
-            
-            if suspicious_percentage < 0.31:
-                return 1   # Few suspicious anchors - legitimate
-            elif suspicious_percentage < 0.67:
-                return 0   # Some suspicious anchors - suspicious
-            else:
-                return -1  # Many suspicious anchors - phishing
-        except:
-            return -1  # Changed from 0 to -1
-    
-    def Links_in_tags(page_content, domain):
-        """15. Check links in meta, script, and link tags"""
-        if not page_content:
-            return -1  # Changed from 0 to -1 for stricter security
-        
-        try:
-            soup = BeautifulSoup(page_content, 'html.parser')
-            
-            # Check meta tags
-            meta_tags = soup.find_all('meta')
-            script_tags = soup.find_all('script')
-            link_tags = soup.find_all('link')
-            
-            total_tags = len(meta_tags) + len(script_tags) + len(link_tags)
-            external_tags = 0
-            
-            for tag in meta_tags + script_tags + link_tags:
-                for attr in ['content', 'src', 'href']:
-                    value = tag.get(attr, '')
-                    if value and value.startswith('http') and domain not in value:
-                        external_tags += 1
-                        break
-            
-            if total_tags == 0:
-                return 1
-            
-            external_percentage = external_tags / total_tags
-            
-            if external_percentage < 0.17:
-                return 1   # Few external links - legitimate
-            elif external_percentage < 0.81:
-                return 0   # Some external links - suspicious
-            else:
-                return -1  # Many external links - phishing
-        except:
-            return -1  # Changed from 0 to -1
-    
-    def SFH(page_content, domain):
-        """16. Server Form Handler - Check form actions"""
-        if not page_content:
-            return -1  # Changed from 0 to -1 for stricter security
-        
-        try:
-            soup = BeautifulSoup(page_content, 'html.parser')
-            forms = soup.find_all('form')
-            
-            if not forms:
-                return 1  # No forms
-            
-            for form in forms:
-                action = form.get('action', '')
-                if action == '' or action == '#':
-                    return -1  # Empty or suspicious action
-                elif action.startswith('http') and domain not in action:
-                    return -1  # External form handler
-                elif 'mailto:' in action:
-                    return -1  # Email form handler
-            
-            return 1  # Normal form handlers
-        except:
-            return -1  # Changed from 0 to -1
-    
-    def Submitting_to_email(page_content):
-        """17. Check if forms submit to email"""
-        if not page_content:
-            return -1  # Changed from 0 to -1 for stricter security
-        
-        try:
-            if 'mailto:' in page_content.lower():
-                return -1  # Form submits to email
-            return 1
-        except:
-            return -1  # Changed from 0 to -1
-    
-    def Abnormal_URL(whois_info, url):
-        """18. Check if URL appears in WHOIS info"""
-        if not whois_info:
-            return -1  # No WHOIS info - suspicious
-        
-        try:
-            whois_text = str(whois_info).lower()
-            domain_name = clean_domain.lower()
-            
-            # Check if domain appears in WHOIS info
-            if domain_name in whois_text:
-                return 1  # Domain found in WHOIS - normal
-            else:
-                return -1  # Domain not in WHOIS - abnormal
-        except:
-            return -1
+    resource_hashes: optional dict that receives a hash of every resource
+    looked up for the call (see FeatureContext.resource_hashes).
     
-    def Redirect(url):
-        """19. Check for redirects"""
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.head(url, headers=headers, timeout=10, allow_redirects=False)
-            
-            if response.status_code in [301, 302, 303, 307, 308]:
-                # Check number of redirects
-                redirect_response = requests.get(url, headers=headers, timeout=10)
-                redirect_count = len(redirect_response.history)
-                
-                if redirect_count <= 1:
-                    return 1   # Few redirects - normal
-                elif redirect_count <= 4:
-                    return 0   # Some redirects - suspicious
-                else:
-                    return -1  # Many redirects - phishing
-            
-            return 1  # No redirects
-        except:
-            return -1  # Changed from 0 to -1 for stricter security
-    
-    def on_mouseover(page_content):
-        """20. Check for mouseover events that change status bar"""
-        if not page_content:
-            return 1
-        
-        try:
-            # Check for suspicious JavaScript mouseover events
-            suspicious_patterns = [
-                'onmouseover.*window.status',
-                'onmouseover.*location.href',
-                'window.status.*onmouseover'
-            ]
-            
-            page_lower = page_content.lower()
-            for pattern in suspicious_patterns:
-                if re.search(pattern, page_lower):
-                    return -1  # Suspicious mouseover
-            
-            return 1  # No suspicious mouseover
-        except:
-            return 1
-    
-    def RightClick(page_content):
-        """21. Check if right-click is disabled"""
-        if not page_content:
-            return 1
-        
+    refresh_cache: compute every feature again and overwrite what the
+    FeatureCache has for them; what RefreshAhead does.
+    
+    executor: optional concurrent.futures.Executor to run the blocking
+    lookups, page analysis and providers on, instead of the extractor's
+    threads and the page worker processes that serve live requests.
+    """
+    names = URL_FEATURE_NAMES if feature_names is None else list(feature_names)
+    providers = FEATURE_REGISTRY.providers_for(names)
+    try:
+        url, parsed_url, domain, clean_domain = _prepare_url(url)
+    except Exception:
+        return [-1] * len(names)
+    
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    blocking_executor = executor or _blocking_executor
+    
+    def remaining():
+        return max(0.0, started + time_budget - loop.time()) if time_budget else None
+    
+    resolver = get_dns_resolver()
+    flights = get_singleflight()
+    cache = get_feature_cache() if FEATURE_CACHE_ENABLED else None
+    trace = trace or NO_TRACE
+    context = FeatureContext(url, parsed_url, domain, clean_domain, trace=trace)
+    cache_keys = {'domain': clean_domain, 'page': url}
+    
+    def shared(key, start):
+        if domain_lookups is None:
+            return flights.do(key, start)
+        task = domain_lookups.get(key)
+        if task is None:
+            task = domain_lookups[key] = asyncio.ensure_future(start())
+        # a cancelled caller must not cancel the lookup for the others
+        return asyncio.shield(task)
+    
+    def resolve(host):
+        return shared(('dns', host), lambda: resolver.resolve(host))
+    
+    async def timed(stage, awaitable, succeeded, size):
+        start = time.perf_counter()
+        result = await awaitable
+        trace.record_stage(stage, time.perf_counter() - start, OUTCOME_OK if succeeded(result) else OUTCOME_ERROR,
+                           size(result))
+        return result
+    
+    # take what the FeatureCache has, a provider's features are all cached or none are
+    values = {}
+    cached_values = {}
+    for scope, key in cache_keys.items():
+        if not cache or refresh_cache or not any(provider.scope == scope for provider in providers):
+            continue
+        cached_values[scope] = cache.get(scope, key) or {}
+        get_refresh_ahead().record(scope, key, url, hit=bool(cached_values[scope]))
+        for provider in providers:
+            if provider.scope == scope and all(name in cached_values[scope] for name in provider.names):
+                for name in provider.names:
+                    values[name] = cached_values[scope][name]
+                    trace.record_feature(name, 0.0, OUTCOME_CACHED)
+    providers = [provider for provider in providers if provider.names[0] not in values]
+    resources = frozenset().union(*(provider.resources for provider in providers))
+    
+    async def whois_lookup():
+        context.whois_info = await timed(
+            'whois',
+            shared(('whois', registered_domain(clean_domain)),
+                   lambda: loop.run_in_executor(blocking_executor, get_whois_info, clean_domain)),
+            lambda whois_info: whois_info is not None,
+            # the raw WHOIS response the record was parsed from
+            lambda whois_info: len(whois_info.text.encode('utf-8')) if getattr(whois_info, 'text', None) else None,
+        )
+    
+    async def dns_lookup():
+        context.addresses = await timed('dns', resolve(clean_domain), bool,
+                                        lambda addresses: resolver.response_size(clean_domain))
+    
+    # providers reading nothing but the page run as soon as it arrives, in the
+    # page task; page text scanning is CPU bound, so off the event loop
+    page_providers = [provider for provider in providers if RESOURCE_PAGE in provider.resources
+                      and provider.resources & NETWORK_RESOURCES <= {RESOURCE_PAGE, RESOURCE_REDIRECTS}]
+    page_computed = {}
+    page_kinds = {_PAGE_ANALYSIS_OF_FEATURE[name] for provider in page_providers for name in provider.names
+                  if name in _PAGE_ANALYSIS_OF_FEATURE}
+    
+    read_body = RESOURCE_PAGE in resources
+    # pages are analyzed in worker processes where the API enabled them
+    page_workers = get_page_worker_pool().enabled and executor is None
+    # parse the DOM while the body streams in, if a DOM feature was asked
+    # for and it is not left to the worker processes
+    parse_dom = read_body and not page_workers and 'dom' in page_kinds
+    
+    async def page_analysis(page_context, stages):
+        # the analyses the PageDigestCache does not have, in a worker process
+        memo = _page_digest_cache(page_context)
+        for kind in page_kinds:
+            value = memo.get((page_context.page_hash, kind)) if memo else MISSING
+            if value is not MISSING:
+                page_context.page_analysis[kind] = value
+        missing = [kind for kind in page_kinds if kind not in page_context.page_analysis]
+        if not missing:
+            return
+        start = time.perf_counter()
         try:
-            # Check for right-click disabling code
-            disable_patterns = [
-                'oncontextmenu.*return false',
-                'oncontextmenu.*false',
-                'event.button.*2',
-                'contextmenu.*preventdefault'
-            ]
-            
-            page_lower = page_content.lower()
-            for pattern in disable_patterns:
-                if re.search(pattern, page_lower):
-                    return -1  # Right-click disabled
-            
-            return 1  # Right-click not disabled
-        except:
-            return 1
-    
-    def popUpWidnow(page_content):
-        """22. Check for popup windows"""
-        if not page_content:
-            return 1
-        
+            analysis = await get_page_worker_pool().analyze(page_context.fetch_result.page_content, missing)
+        except PageWorkersOverloaded:
+            if shed_load:
+                raise
+            stages.append(('page_analysis', time.perf_counter() - start, OUTCOME_FALLBACK))
+            return
+        except Exception as e:
+            # analyzed in this process instead
+            logging.info(f"Page analysis in a worker process failed for {url}: {e}")
+            stages.append(('page_analysis', time.perf_counter() - start, OUTCOME_ERROR))
+            return
+        stages.append(('page_analysis', time.perf_counter() - start, OUTCOME_OK))
+        for kind, value in analysis.items():
+            page_context.page_analysis[kind] = value
+            if memo:
+                memo.set((page_context.page_hash, kind), value, analysis_nbytes(kind, value))
+    
+    async def fetch_page():
+        # shared by the concurrent calls for the page, so it fills a context
+        # and stage list of its own instead of this call's
+        page_context = FeatureContext(url, parsed_url, domain, clean_domain)
+        stages = []
+        # resolve the host first so the HTTP connection reuses the cached address
+        if parsed_url.hostname:
+            await resolve(parsed_url.hostname)
+        start = time.perf_counter()
+        fetch_result = await loop.run_in_executor(
+            blocking_executor, fetch_url, url, parse_dom, read_body,
+        )
+        if fetch_result.ok:
+            fetch_outcome = OUTCOME_OK
+        elif fetch_result.error == CIRCUIT_OPEN_ERROR:
+            fetch_outcome = OUTCOME_FALLBACK
+        else:
+            fetch_outcome = error_outcome(fetch_result.error)
+        stages.append(('page_fetch', time.perf_counter() - start, fetch_outcome, fetch_result.body_bytes))
+        page_context.fetch_result = fetch_result
+        if parse_dom and fetch_result.page_content:
+            # the streamed digest, memoized under the body hash for the next copy of the page
+            digest = fetch_result.dom_digest
+            page_context.page_analysis['dom'] = digest
+            memo = _page_digest_cache(page_context)
+            if memo:
+                memo.set((page_context.page_hash, 'dom'), digest, analysis_nbytes('dom', digest))
+        if page_kinds and page_workers and fetch_result.page_content:
+            await page_analysis(page_context, stages)
+        return page_context, stages
+    
+    async def page_fetch():
+        page_key = ('page', normalize_url(url), read_body, parse_dom, frozenset(page_kinds), shed_load)
+        page_context, stages = await flights.do(page_key, fetch_page)
+        for stage in stages:
+            trace.record_stage(*stage)
+        context.fetch_result = page_context.fetch_result
+        context.page_hash = page_context.page_hash
+        context.page_analysis.update(page_context.page_analysis)
+        if page_providers:
+            page_computed.update(
+                await loop.run_in_executor(blocking_executor, _run_providers, page_providers, context)
+            )
+    
+    # resource -> (stage, task fetching it)
+    fetches = {}
+    if RESOURCE_WHOIS in resources:
+        fetches[RESOURCE_WHOIS] = ('whois', asyncio.ensure_future(whois_lookup()))
+    if RESOURCE_DNS in resources:
+        fetches[RESOURCE_DNS] = ('dns', asyncio.ensure_future(dns_lookup()))
+    if resources & {RESOURCE_PAGE, RESOURCE_REDIRECTS}:
+        fetches[RESOURCE_PAGE] = fetches[RESOURCE_REDIRECTS] = ('page_fetch', asyncio.ensure_future(page_fetch()))
+    
+    unfinished = set()
+    if fetches:
+        tasks = {task for _, task in fetches.values()}
+        done, pending = await asyncio.wait(tasks, timeout=remaining())
+        for task in pending:
+            task.cancel()
+        for task in done:
+            task.result()
+        for resource, (stage, task) in fetches.items():
+            if task not in pending:
+                continue
+            if stage == 'page_fetch' and context.fetch_result is not None:
+                # the page arrived, only its analysis is unfinished; it ends
+                # in its thread, keep it out of the trace
+                context.trace = NO_TRACE
+                continue
+            unfinished.add(resource)
+            trace.record_stage(stage, loop.time() - started, OUTCOME_TIMEOUT)
+    
+    def timed_out(providers):
+        for provider in providers:
+            for name in provider.names:
+                values[name] = np.nan
+                trace.record_feature(name, loop.time() - started, OUTCOME_TIMEOUT)
+    
+    late = [provider for provider in providers
+            if provider.resources & unfinished or (provider in page_providers and not page_computed)]
+    timed_out(late)
+    providers = [provider for provider in providers if provider not in late]
+    
+    computed = dict(page_computed)
+    rest = [provider for provider in providers if provider not in page_providers]
+    # providers reading the page together with other lookups, none of the 30 features
+    late_page_providers = [provider for provider in rest if RESOURCE_PAGE in provider.resources]
+    computed.update(_run_providers([provider for provider in rest if provider not in late_page_providers], context))
+    if late_page_providers:
         try:
-            # Check for popup window code
-            popup_patterns = [
-                'window.open',
-                'popup',
-                'alert\(',
-                'confirm\('
-            ]
-            
-            page_lower = page_content.lower()
-            popup_count = sum(1 for pattern in popup_patterns if pattern in page_lower)
-            
-            if popup_count == 0:
-                return 1   # No popups
-            elif popup_count <= 2:
-                return 0   # Few popups - suspicious
+            computed.update(await asyncio.wait_for(
+                loop.run_in_executor(blocking_executor, _run_providers, late_page_providers, context),
+                timeout=remaining(),
+            ))
+        except asyncio.TimeoutError:
+            context.trace = NO_TRACE
+            timed_out(late_page_providers)
+    values.update(computed)
+    
+    if cache:
+        for scope, key in cache_keys.items():
+            # features returned as NaN are not cached
+            scoped = [provider for provider in providers if provider.scope == scope and provider.names[0] in computed]
+            if not scoped:
+                continue
+            if scope == 'page' and not context.fetch_result.ok:
+                continue
+            scope_values = {**cached_values.get(scope, {}),
+                            **{name: computed[name] for provider in scoped for name in provider.names}}
+            if scope == 'page':
+                cache.set_page(key, scope_values)
             else:
-                return -1  # Many popups - phishing
-        except:
-            return 1
-    
-    def Iframe(page_content):
-        """23. Check for iframe usage"""
-        if not page_content:
-            return 1
+                # retried sooner when the WHOIS or DNS lookup behind them failed
+                complete = all(context.available(resource) for provider in scoped for resource in provider.resources)
+                complete = complete and (bool(context.addresses) or not any(
+                    RESOURCE_DNS in provider.resources for provider in scoped))
+                cache.set_domain(key, scope_values, complete=complete)
+    
+    if resource_hashes is not None:
+        resource_hashes.update(context.resource_hashes())
+    return [values[name] for name in names]
+
+
+def _run_providers(providers, context) -> dict:
+    """Compute the features of providers, recording each with its provider's time and outcome"""
+    values = {}
+    for provider in providers:
+        if provider.placeholder or not all(context.available(resource) for resource in provider.resources):
+            outcome = OUTCOME_FALLBACK
+        else:
+            outcome = OUTCOME_OK
         
+        start = time.perf_counter()
         try:
-            soup = BeautifulSoup(page_content, 'html.parser')
-            iframes = soup.find_all('iframe')
-            
-            if not iframes:
-                return 1  # No iframes
-            
-            # Check for invisible or suspicious iframes
-            suspicious_iframes = 0
-            for iframe in iframes:
-                width = iframe.get('width', '100')
-                height = iframe.get('height', '100')
-                style = iframe.get('style', '')
-                
-                # Check for invisible iframes
-                if (width in ['0', '1'] or height in ['0', '1'] or 
-                    'display:none' in style.replace(' ', '') or
-                    'visibility:hidden' in style.replace(' ', '')):
-                    suspicious_iframes += 1
-            
-            if suspicious_iframes == 0:
-                return 1   # No suspicious iframes
-            elif suspicious_iframes <= len(iframes) // 2:
-                return 0   # Some suspicious iframes
-            else:
-                return -1  # Many suspicious iframes
-        except:
-            return 1
-    
-    def age_of_domain(whois_info):
-        """24. Check domain age"""
-        try:
-            if whois_info and whois_info.creation_date:
-                create_date = whois_info.creation_date
-                if isinstance(create_date, list):
-                    create_date = create_date[0]
-                
-                if isinstance(create_date, datetime):
-                    age_days = (datetime.now() - create_date).days
-                    
-                    if age_days >= 180:  # 6 months
-                        return 1   # Old domain - legitimate
-                    elif age_days >= 30:  # 1 month
-                        return 0   # Medium age - suspicious
-                    else:
-                        return -1  # New domain - phishing
-            
-            return -1  # No creation date - suspicious
-        except:
-            return -1
-    
-    def DNSRecord(domain):
-        """25. Check if domain has DNS record"""
-        try:
-            socket.gethostbyname(domain)
-            return 1  # DNS record exists
-        except:
-            return -1  # No DNS record
-    
-    def web_traffic(domain):
-        """26. Website traffic - now more strict"""
-        # Since we can't access external APIs, assume low traffic = suspicious
-        # Most legitimate sites have some traffic data available
-        return -1  # Changed from 0 to -1 for stricter security
-    
-    def Page_Rank(domain):
-        """27. Page rank - now more strict"""
-        # Since we can't access Google PageRank, assume no PageRank = suspicious
-        # Most legitimate sites have some PageRank
-        return -1  # Changed from 0 to -1 for stricter security
-    
-    def Google_Index(url):
-        """28. Check if indexed by Google - now more strict"""
-        # Since we can't check Google indexing, assume not indexed = suspicious
-        # Most legitimate sites are indexed by Google
-        return -1  # Changed from 0 to -1 for stricter security
-    
-    def Links_pointing_to_page(domain):
-        """29. Number of links pointing to page - now more strict"""
-        # Since we can't check backlinks, assume no backlinks = suspicious
-        # Most legitimate sites have some backlinks
-        return -1  # Changed from 0 to -1 for stricter security
-    
-    def Statistical_report(domain):
-        """30. Statistical report based on other security services - now more strict"""
-        # Since we can't check threat intelligence, assume unknown = suspicious
-        # Most legitimate sites have clean reputation
-        return -1  # Changed from 0 to -1 for stricter security
-    
-    # Main feature extraction
-    features = []
-    
-    try:
-        # Get WHOIS info and page content (with timeout)
-        whois_info = get_whois_info(clean_domain)
-        page_content = get_page_content(url)
+            provider_values = provider.compute(context)
+        except Exception as e:
+            logging.info(f"Error extracting {', '.join(provider.names)}: {e}")
+            provider_values = {name: -1 for name in provider.names}
+            outcome = OUTCOME_ERROR
+        seconds = time.perf_counter() - start
         
-        # Extract all 30 features in the specified order
-        features.append(having_IP_Address(url))                        # 1
-        features.append(URL_Length(url))                              # 2
-        features.append(Shortining_Service(url))                      # 3
-        features.append(having_At_Symbol(url))                        # 4
-        features.append(double_slash_redirecting(url))                # 5
-        features.append(Prefix_Suffix(domain))                        # 6
-        features.append(having_Sub_Domain(url))                       # 7
-        features.append(SSLfinal_State(url, domain))                  # 8
-        features.append(Domain_registeration_length(whois_info))      # 9
-        features.append(Favicon(url, page_content))                   # 10
-        features.append(port(url))                                    # 11
-        features.append(HTTPS_token(url))                             # 12
-        features.append(Request_URL(page_content, clean_domain))      # 13
-        features.append(URL_of_Anchor(page_content, clean_domain))    # 14
-        features.append(Links_in_tags(page_content, clean_domain))    # 15
-        features.append(SFH(page_content, clean_domain))              # 16
-        features.append(Submitting_to_email(page_content))            # 17
-        features.append(Abnormal_URL(whois_info, url))                # 18
-        features.append(Redirect(url))                                # 19
-        features.append(on_mouseover(page_content))                   # 20
-        features.append(RightClick(page_content))                     # 21
-        features.append(popUpWidnow(page_content))                    # 22
-        features.append(Iframe(page_content))                         # 23
-        features.append(age_of_domain(whois_info))                    # 24
-        features.append(DNSRecord(clean_domain))                      # 25
-        features.append(web_traffic(clean_domain))                    # 26
-        features.append(Page_Rank(clean_domain))                      # 27
-        features.append(Google_Index(url))                            # 28
-        features.append(Links_pointing_to_page(clean_domain))         # 29
-        features.append(Statistical_report(clean_domain))             # 30
-        
-    except Exception as e:
-        print(f"Error extracting features: {e}")
-        features = [-1] * 30
-    
-    # Ensure exactly 30 features
-    while len(features) < 30:
-        features.append(-1)
-    
-    return features[:30]
\ No newline at end of file
+        for name in provider.names:
+            values[name] = provider_values[name]
+            context.trace.record_feature(name, seconds, outcome)
+    return values
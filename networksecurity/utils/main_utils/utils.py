@@ -22,6 +22,19 @@ def read_yaml_file(file_path: str )-> dict:
         raise NetworkSecurityException(e,sys) from e
     
     
+def get_feature_columns(schema_file_path: str, target_column: str) -> list:
+    """
+    Feature column names in the order they are listed in the schema file,
+    without the target column
+    """
+    try:
+        schema = read_yaml_file(schema_file_path)
+        columns = [list(column.keys())[0] for column in schema["columns"]]
+        return [column for column in columns if column != target_column]
+    except Exception as e:
+        raise NetworkSecurityException(e, sys) from e
+    
+    
 def write_yaml_file(file_path: str, content: object, replace: bool = False) -> None:
     try:
         if replace:
@@ -52,8 +65,11 @@ def save_object(file_path: str, obj: object) -> None:
     try:
         logging.info("Entered the save_object method of MainUtils class")
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, "wb") as file_obj:
+        # written aside and renamed, readers never see a half written file
+        temp_file_path = f"{file_path}.tmp"
+        with open(temp_file_path, "wb") as file_obj:
             pickle.dump(obj, file_obj)
+        os.replace(temp_file_path, file_path)
         logging.info("Exited the save_object method of MainUtils class")
     except Exception as e:
         raise NetworkSecurityException(e, sys) from e
@@ -64,7 +80,6 @@ def load_object(file_path: str, ) -> object:
         if not os.path.exists(file_path):
             raise Exception(f"The file: {file_path} is not exists")
         with open(file_path, "rb") as file_obj:
-            print(file_obj)
             return pickle.load(file_obj)
     except Exception as e:
         raise NetworkSecurityException(e, sys) from e
@@ -21,4 +21,27 @@ class NetworkModel:
             y_hat = self.model.predict(x_transform)
             return y_hat
         except Exception as e:
-            raise NetworkSecurityException(e,sys)
\ No newline at end of file
+            raise NetworkSecurityException(e,sys)
+
+class LexicalModel:
+    """
+    Classifier trained on the URL-string features only. It is the first tier
+    of the /predict_url cascade and needs no preprocessor because lexical
+    features are never missing.
+    """
+    def __init__(self,model,feature_names):
+        try:
+            self.model = model
+            self.feature_names = feature_names
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+    
+    def predict_with_confidence(self,x):
+        """Predicted labels and the probability the model gives each of them"""
+        try:
+            probabilities = self.model.predict_proba(x)
+            y_hat = self.model.classes_[probabilities.argmax(axis=1)]
+            confidence = probabilities.max(axis=1)
+            return y_hat, confidence
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
@@ -0,0 +1,211 @@
+import hashlib
+import json
+import os
+import pickle
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from networksecurity.constant.training_pipeline import (
+    MODEL_SERVING_MANIFEST_FILE_PATH,
+    MODEL_SERVING_PREPROCESSOR_FILE_PATH,
+    MODEL_SERVING_MODEL_FILE_PATH,
+    MODEL_SERVING_RELOAD_INTERVAL,
+    MODEL_TRAINER_LEXICAL_MODEL_FILE_PATH,
+)
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.ml_utils.model.estimator import NetworkModel
+
+# artifact name -> file path of the artifacts served together
+SERVED_ARTIFACT_FILE_PATHS = {
+    "preprocessor": MODEL_SERVING_PREPROCESSOR_FILE_PATH,
+    "model": MODEL_SERVING_MODEL_FILE_PATH,
+    "lexical_model": MODEL_TRAINER_LEXICAL_MODEL_FILE_PATH,
+}
+
+
+@dataclass(frozen=True)
+class ModelSnapshot:
+    """
+    Models served together, never changed once loaded. network_model is None
+    until a model was trained, lexical_model until a lexical model was.
+    """
+    version: str
+    network_model: Optional[NetworkModel]
+    lexical_model: object
+    loaded_at: float
+
+    def describe(self) -> dict:
+        return {
+            "version": self.version,
+            "loaded_at": datetime.fromtimestamp(self.loaded_at).isoformat(timespec="seconds"),
+            "network_model": self.network_model is not None,
+            "lexical_model": self.lexical_model is not None,
+        }
+
+
+def _artifact_digest(content: bytes) -> str:
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def _manifest_version(artifacts: dict) -> str:
+    version = hashlib.blake2b(digest_size=6)
+    for name in sorted(artifacts):
+        version.update(f"{name}={artifacts[name]};".encode("utf-8"))
+    return version.hexdigest()
+
+
+def write_model_manifest(file_paths: dict = SERVED_ARTIFACT_FILE_PATHS,
+                         manifest_file_path: str = MODEL_SERVING_MANIFEST_FILE_PATH) -> str:
+    """
+    Record the hashes of the artifacts in file_paths (name -> file path)
+    that exist in the manifest LiveModels reloads from, returns the version.
+    Written after the artifacts, and replaced in one rename: a new manifest
+    means every artifact it lists is in place.
+    """
+    try:
+        artifacts = {}
+        for name, file_path in file_paths.items():
+            if os.path.exists(file_path):
+                with open(file_path, "rb") as file_obj:
+                    artifacts[name] = _artifact_digest(file_obj.read())
+        version = _manifest_version(artifacts)
+        dir_path = os.path.dirname(manifest_file_path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+        temp_file_path = f"{manifest_file_path}.tmp"
+        with open(temp_file_path, "w") as file_obj:
+            json.dump({"version": version, "written_at": datetime.now().isoformat(timespec="seconds"),
+                       "artifacts": artifacts}, file_obj, indent=2)
+        os.replace(temp_file_path, manifest_file_path)
+        logging.info(f"Wrote model version {version} to {manifest_file_path}: {artifacts}")
+        return version
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+class LiveModels:
+    """
+    The NetworkModel (preprocessor and model) and LexicalModel served by the
+    API, loaded once and kept in memory. A request takes current() once and
+    uses that snapshot to the end; reload() loads new artifacts aside and
+    swaps the snapshot in a single assignment, so requests in flight finish
+    on the models they started with.
+
+    What is served is what the manifest (see write_model_manifest) lists.
+    The trainer writes it after every artifact, so artifacts written one
+    after the other (the preprocessor minutes before the model) only go live
+    together, once the manifest changes. It is checked for changes at most
+    every reload_interval seconds, in the background of the next current().
+    Every artifact is hashed from the very bytes unpickled and must match the
+    manifest; a version that does not, or fails to load, is logged and the
+    live one kept. Without a manifest the artifacts found are served as they
+    are, until one is written.
+    """
+
+    def __init__(self, preprocessor_file_path: str = MODEL_SERVING_PREPROCESSOR_FILE_PATH,
+                 model_file_path: str = MODEL_SERVING_MODEL_FILE_PATH,
+                 lexical_model_file_path: str = MODEL_TRAINER_LEXICAL_MODEL_FILE_PATH,
+                 manifest_file_path: str = MODEL_SERVING_MANIFEST_FILE_PATH,
+                 reload_interval: float = MODEL_SERVING_RELOAD_INTERVAL):
+        self.file_paths = {
+            "preprocessor": preprocessor_file_path,
+            "model": model_file_path,
+            "lexical_model": lexical_model_file_path,
+        }
+        self.manifest_file_path = manifest_file_path
+        self.reload_interval = reload_interval
+        self._snapshot = None
+        self._loaded_stat = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _manifest_stat(self):
+        try:
+            stat = os.stat(self.manifest_file_path)
+            return stat.st_mtime_ns, stat.st_size, stat.st_ino
+        except OSError:
+            return None
+
+    def _read_manifest(self):
+        """artifact name -> hash listed in the manifest, None without one"""
+        if not os.path.exists(self.manifest_file_path):
+            return None
+        with open(self.manifest_file_path) as file_obj:
+            return json.load(file_obj)["artifacts"]
+
+    def _load(self) -> ModelSnapshot:
+        manifest = self._read_manifest()
+        if manifest is None:
+            names = [name for name, file_path in self.file_paths.items() if os.path.exists(file_path)]
+        else:
+            names = list(manifest)
+
+        objects, artifacts = {}, {}
+        for name in names:
+            with open(self.file_paths[name], "rb") as file_obj:
+                content = file_obj.read()
+            artifacts[name] = _artifact_digest(content)
+            if manifest is not None and artifacts[name] != manifest[name]:
+                raise Exception(f"{self.file_paths[name]} does not match {self.manifest_file_path}, "
+                                f"it was written after the manifest")
+            objects[name] = pickle.loads(content)
+
+        network_model = None
+        if "model" in objects:
+            network_model = NetworkModel(preprocessor=objects["preprocessor"], model=objects["model"])
+        return ModelSnapshot(_manifest_version(artifacts), network_model, objects.get("lexical_model"), time.time())
+
+    def reload(self, force: bool = True) -> ModelSnapshot:
+        """Load the artifacts if the manifest changed (always when force) and serve them, returns the live snapshot"""
+        try:
+            with self._lock:
+                self._checked_at = time.monotonic()
+                stat = self._manifest_stat()
+                if self._snapshot is not None and not force and stat == self._loaded_stat:
+                    return self._snapshot
+                snapshot = self._load()
+                self._snapshot, self._loaded_stat = snapshot, stat
+                logging.info(f"Serving model version {snapshot.version}: {snapshot.describe()}")
+                return snapshot
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _reload_in_background(self) -> None:
+        try:
+            self.reload(force=False)
+        except Exception as e:
+            logging.info(f"Keeping model version {self._snapshot.version}, loading the new artifacts failed: {e}")
+
+    def current(self) -> ModelSnapshot:
+        """The live snapshot, loaded on first use"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return self.reload(force=False)
+        if time.monotonic() - self._checked_at >= self.reload_interval and not self._lock.locked():
+            self._checked_at = time.monotonic()
+            threading.Thread(target=self._reload_in_background, daemon=True).start()
+        return snapshot
+
+
+_live_models = None
+_live_models_lock = threading.Lock()
+
+
+def get_live_models() -> LiveModels:
+    """Process wide LiveModels serving the artifacts under final_model/"""
+    global _live_models
+    if _live_models is None:
+        with _live_models_lock:
+            if _live_models is None:
+                _live_models = LiveModels()
+    return _live_models
+
+
+if __name__ == "__main__":
+    # artifacts copied into final_model/ by hand go live once this records them
+    print(f"Model version {write_model_manifest()}")
@@ -37,6 +37,7 @@ setup(
     author="Ashutosh",
     author_email="ashlyyy6969@gmail.com",
     packages=find_packages(),
+    package_data={"networksecurity": ["utils/extractor_utils/data/*.dat"]},
     install_requires=get_requirements()
 )
                     